@@ -4,7 +4,9 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import time
+from services.ai_predictor import AIPredictor
+from services.service_container import get_services
+from components.backtest import render_backtest_panel
 
 # Configure page
 st.set_page_config(
@@ -94,29 +96,24 @@ model_type = st.sidebar.selectbox(
     ["LSTM Neural Network", "Random Forest", "XGBoost", "Ensemble Model"]
 )
 
+user_inputs = {
+    'market_type': market_type,
+    'selected_asset': selected_asset,
+    'prediction_horizon': prediction_horizon,
+    'investment_amount': investment_amount,
+    'risk_level': risk_level,
+    'model_type': model_type
+}
+
 # Main content area
 col1, col2, col3 = st.columns([1, 2, 1])
 
 with col2:
     if st.button("🔮 Generate Prediction", type="primary", use_container_width=True):
-        # Simulate AI processing
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i in range(100):
-            progress_bar.progress(i + 1)
-            if i < 30:
-                status_text.text("Collecting market data...")
-            elif i < 60:
-                status_text.text("Running AI analysis...")
-            elif i < 90:
-                status_text.text("Calculating predictions...")
-            else:
-                status_text.text("Finalizing results...")
-            time.sleep(0.02)
-        
-        status_text.empty()
-        progress_bar.empty()
+        # Run the staged prediction pipeline with progress
+        predictor = AIPredictor(user_inputs)
+        st.session_state.prediction_data = predictor.generate_prediction()
+        st.session_state.prediction_generated = True
 
 # Generate mock prediction data
 if 'prediction_generated' not in st.session_state:
@@ -125,12 +122,13 @@ if 'prediction_generated' not in st.session_state:
 if st.session_state.get('prediction_generated', False) or st.sidebar.button("Show Sample Results"):
     st.session_state.prediction_generated = True
     
-    # Mock prediction results
+    # Prediction results (sample results run the pipeline without progress)
     np.random.seed(42)
-    current_price = np.random.uniform(50, 200)
-    predicted_change = np.random.uniform(-0.05, 0.05)
-    predicted_price = current_price * (1 + predicted_change)
-    confidence = np.random.uniform(0.65, 0.95)
+    prediction_data = st.session_state.get('prediction_data') or AIPredictor(user_inputs).predict()
+    current_price = prediction_data['current_price']
+    predicted_change = prediction_data['predicted_change']
+    predicted_price = prediction_data['predicted_price']
+    confidence = prediction_data['confidence']
     
     # Prediction display
     st.markdown(f"""
@@ -300,6 +298,10 @@ if st.session_state.get('prediction_generated', False) or st.sidebar.button("Sho
         - **Timeframe:** {prediction_horizon}
         """)
 
+# Walk-forward backtest of the recommendation strategy, run in a process pool
+if st.session_state.get('show_backtest', False):
+    render_backtest_panel(get_services().get("backtester"), user_inputs)
+
 # Footer
 st.markdown("---")
 st.markdown("⚠️ **Disclaimer**: This is a demo AI trading system. Always consult with financial advisors before making investment decisions.")
@@ -312,7 +314,9 @@ if st.sidebar.button("📊 Market Overview"):
     st.sidebar.info("Market overview feature coming soon!")
 
 if st.sidebar.button("📈 Backtesting"):
-    st.sidebar.info("Backtesting module in development!")
+    # The panel renders above the footer, so rerun to show it
+    st.session_state.show_backtest = True
+    st.rerun()
 
 if st.sidebar.button("⚙️ Model Settings"):
     st.sidebar.info("Advanced settings panel coming soon!")
\ No newline at end of file
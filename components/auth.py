@@ -1,17 +1,14 @@
 import streamlit as st
 import hashlib
-from utils.user_database import UserDatabase
 from components.user_dashboard import UserDashboard
 from datetime import datetime
 
-st.session_state.login_time = datetime.now().isoformat()
-
-
 
 class AuthManager:
-    def __init__(self):
-        self.user_db = UserDatabase()
-        self.dashboard = UserDashboard()
+    def __init__(self, user_db, activity_writer):
+        self.user_db = user_db
+        self.activity_writer = activity_writer
+        self.dashboard = UserDashboard(user_db)
     
     def render_auth_page(self):
         """Main authentication page"""
@@ -122,8 +119,8 @@ class AuthManager:
         st.session_state.is_demo = False
         st.session_state.login_time = datetime.now().isoformat()
         
-        # Log login activity
-        self.user_db.log_user_activity(username, "login")
+        # Log login activity without blocking the rerun on disk I/O
+        self.activity_writer.log(username, "login")
         
         st.success("✅ Login successful!")
         st.rerun()
@@ -0,0 +1,99 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from config.settings import CHART_WIDTH_PX, CHART_POINTS_PER_PIXEL
+from components.charts import epoch_ms
+from utils.downsampling import downsample
+
+def render_backtest_panel(backtester, user_inputs):
+    """Render a walk-forward backtest of the recommendation strategy for the selected horizon"""
+    horizon = user_inputs['prediction_horizon']
+    st.subheader(f"📈 Backtest: {horizon} Recommendations")
+    
+    with st.spinner("Running walk-forward backtest..."):
+        try:
+            report = backtester.run(horizon)
+        except ValueError as exc:
+            st.warning(str(exc))
+            report = None
+    
+    if report is not None:
+        st.caption(
+            f"{report['assets']} assets • {report['asset_years']:,.0f} asset-years • "
+            f"{report['windows']} walk-forward windows • {report['elapsed_seconds']:.2f}s"
+        )
+        render_walk_forward_metrics(report['walk_forward'])
+        st.plotly_chart(build_equity_figure(report), use_container_width=True)
+        render_param_table(report['param_stats'])
+    
+    if st.button("Close Backtest"):
+        st.session_state.show_backtest = False
+        st.rerun()
+
+def render_walk_forward_metrics(stats):
+    """Out-of-sample headline numbers"""
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Total Return", f"{stats['total_return'] * 100:+.1f}%")
+    col2.metric("Max Drawdown", f"{stats['max_drawdown'] * 100:.1f}%")
+    # Both are undefined (NaN) without trades or without return variation
+    col3.metric("Hit Rate", format_stat(stats['hit_rate'] * 100, ".1f", "%"))
+    col4.metric("Trades", f"{int(stats['trades']):,}")
+    col5.metric("Sharpe", format_stat(stats['sharpe'], ".2f"))
+
+def format_stat(value, spec, suffix=""):
+    """Format a statistic, showing "n/a" rather than "nan" when it is undefined"""
+    return f"{value:{spec}}{suffix}" if np.isfinite(value) else "n/a"
+
+def build_equity_figure(report):
+    """Walk-forward equity curve above its drawdown"""
+    budget = CHART_WIDTH_PX * CHART_POINTS_PER_PIXEL
+    x = epoch_ms(report['timestamps'])
+    equity_x, equity_y = downsample(x, report['equity'].astype(np.float32), budget)
+    drawdown_x, drawdown_y = downsample(x, (report['drawdown'] * 100).astype(np.float32), budget)
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.05)
+    fig.add_trace(go.Scattergl(
+        x=equity_x, y=equity_y, mode='lines', name='Equity',
+        line=dict(color='blue', width=2)
+    ), row=1, col=1)
+    fig.add_trace(go.Scattergl(
+        x=drawdown_x, y=drawdown_y, mode='lines', name='Drawdown (%)',
+        line=dict(color='red', width=1), fill='tozeroy'
+    ), row=2, col=1)
+    fig.update_xaxes(type="date")
+    fig.update_yaxes(title_text="Equity", row=1, col=1)
+    fig.update_yaxes(title_text="Drawdown (%)", row=2, col=1)
+    fig.update_layout(title="Out-of-Sample Equity", height=450, showlegend=False)
+    return fig
+
+def render_param_table(param_stats):
+    """Full-sample results for every stop-loss / minimum-edge pair"""
+    df = pd.DataFrame({
+        'Stop Loss (%)': [p['stop_loss'] * 100 for p in param_stats],
+        'Min Edge (%)': [p['min_edge'] * 100 for p in param_stats],
+        'Total Return (%)': [p['total_return'] * 100 for p in param_stats],
+        'Max Drawdown (%)': [p['max_drawdown'] * 100 for p in param_stats],
+        'Hit Rate (%)': [p['hit_rate'] * 100 for p in param_stats],
+        'Trades': [int(p['trades']) for p in param_stats],
+        'Targets Hit (%)': [p['target_rate'] * 100 for p in param_stats],
+        'Stopped Out (%)': [p['stop_rate'] * 100 for p in param_stats],
+        'Sharpe': [p['sharpe'] for p in param_stats]
+    }).sort_values('Total Return (%)', ascending=False)
+    
+    st.dataframe(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Stop Loss (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Min Edge (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Total Return (%)': st.column_config.NumberColumn(format="%+.1f"),
+            'Max Drawdown (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Hit Rate (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Targets Hit (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Stopped Out (%)': st.column_config.NumberColumn(format="%.1f"),
+            'Sharpe': st.column_config.NumberColumn(format="%.2f")
+        }
+    )
@@ -1,12 +1,30 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from functools import lru_cache
+from config.settings import HORIZON_SECONDS, CHART_WIDTH_PX, CHART_POINTS_PER_PIXEL
+from components.figure_cache import cached_figure, patch_traces
+from utils.downsampling import downsample
+from utils.history_store import HistoryStore
+from utils.tick_store import TickStore
 
+# Selectable history windows in seconds; None shows everything stored
+CHART_RANGES = {
+    "1M": 30 * 24 * 3600,
+    "3M": 91 * 24 * 3600,
+    "1Y": 365 * 24 * 3600,
+    "All": None
+}
+PREDICTION_POINTS = 8
+LIVE_TICKS = 2000
+
+SCENARIOS = ['Best Case', 'Most Likely', 'Worst Case']
+SCENARIO_MULTIPLIERS = np.array([1.1, 1.0, 0.9])
+SCENARIO_PROBABILITIES = np.array([0.2, 0.6, 0.2], dtype=np.float32)
+
+@st.fragment
 def render_charts(prediction_data, user_inputs):
-    """Render all charts and visualizations"""
+    """Render all charts; a fragment, so the range selector reruns only the charts"""
     st.subheader("📈 Price Analysis & Predictions")
     
     chart_col1, chart_col2 = st.columns(2)
@@ -17,27 +35,31 @@ def render_charts(prediction_data, user_inputs):
     with chart_col2:
         render_scenario_chart(prediction_data)
 
-def render_price_chart(prediction_data, user_inputs):
-    """Render historical price and prediction chart"""
-    dates = pd.date_range(
-        start=datetime.now() - timedelta(days=30), 
-        end=datetime.now() + timedelta(days=7), 
-        freq='D'
-    )
-    
-    current_price = prediction_data['current_price']
-    predicted_price = prediction_data['predicted_price']
-    
-    # Generate mock historical data
-    historical_prices = current_price + np.cumsum(np.random.randn(len(dates)) * 2)
-    historical_prices[-7:] = np.linspace(historical_prices[-8], predicted_price, 7)
+def epoch_ms(timestamps):
+    """Epoch seconds as float64 milliseconds, which Plotly date axes plot directly"""
+    return np.asarray(timestamps, dtype=np.float64) * 1000
+
+@lru_cache(maxsize=128)
+def downsampled_history(asset, range_seconds, budget, version):
+    """Close prices for a chart range reduced to ``budget`` points.
     
+    Cached per (asset, range, budget); ``version`` is the store's bar count,
+    so appending history produces a new entry instead of a stale one.
+    Returned as (epoch ms float64, price float32), ready to send.
+    """
+    store = HistoryStore.open()
+    last_timestamp = int(store.tail(asset, 1)['timestamp'][-1])
+    start = None if range_seconds is None else last_timestamp - range_seconds
+    history = store.range(asset, start=start)
+    timestamps, prices = downsample(history['timestamp'], history['close'], budget)
+    return epoch_ms(timestamps), np.asarray(prices, dtype=np.float32)
+
+def build_price_figure(asset):
+    """Layout and empty traces for an asset's price chart"""
     fig = go.Figure()
     
     # Historical data
-    fig.add_trace(go.Scatter(
-        x=dates[:-7],
-        y=historical_prices[:-7],
+    fig.add_trace(go.Scattergl(
         mode='lines',
         name='Historical Price',
         line=dict(color='blue', width=2)
@@ -45,40 +67,105 @@ def render_price_chart(prediction_data, user_inputs):
     
     # Prediction
     fig.add_trace(go.Scatter(
-        x=dates[-8:],
-        y=historical_prices[-8:],
         mode='lines',
         name='AI Prediction',
         line=dict(color='red', width=3, dash='dash')
     ))
     
+    # Live ticks from the in-memory ring buffer, shown once a feed is running
+    fig.add_trace(go.Scattergl(
+        mode='lines',
+        name='Live',
+        line=dict(color='green', width=1)
+    ))
+    
     fig.update_layout(
-        title=f"{user_inputs['selected_asset']} Price Trend & Prediction",
+        title=f"{asset} Price Trend & Prediction",
         xaxis_title="Date",
+        xaxis_type="date",
         yaxis_title="Price ($)",
         height=400
     )
+    return fig
+
+def render_price_chart(prediction_data, user_inputs):
+    """Render historical price and prediction chart"""
+    store = HistoryStore.open()
+    asset = user_inputs['selected_asset']
+    horizon = user_inputs['prediction_horizon']
+    tick_buffer = TickStore.open().buffer(asset)
+    budget = CHART_WIDTH_PX * CHART_POINTS_PER_PIXEL
+    
+    chart_range = st.radio(
+        "Range", list(CHART_RANGES), horizontal=True, key="price_chart_range",
+        label_visibility="collapsed"
+    )
+    version = store.version(asset)
+    
+    def make_traces():
+        history_x, history_y = downsampled_history(asset, CHART_RANGES[chart_range], budget, version)
+        
+        # Prediction path from the latest bar to the end of the horizon
+        last_timestamp = int(store.tail(asset, 1)['timestamp'][-1])
+        horizon_seconds = HORIZON_SECONDS.get(horizon, store.bar_seconds)
+        prediction_x, prediction_y = downsample(
+            epoch_ms(np.linspace(last_timestamp, last_timestamp + horizon_seconds, PREDICTION_POINTS)),
+            np.linspace(
+                prediction_data['current_price'], prediction_data['predicted_price'], PREDICTION_POINTS
+            ).astype(np.float32),
+            budget
+        )
+        
+        live = TickStore.open().mid_prices(asset, LIVE_TICKS)
+        live_x, live_y = downsample(
+            epoch_ms(live['timestamp']), live['price'].astype(np.float32), budget
+        )
+        return [
+            dict(x=history_x, y=history_y),
+            dict(x=prediction_x, y=prediction_y),
+            dict(x=live_x, y=live_y, showlegend=bool(len(live_y)))
+        ]
+    
+    # Reruns that change nothing on this chart reuse the figure untouched
+    entry = cached_figure(('price', asset), lambda: build_price_figure(asset))
+    data_key = (chart_range, budget, version, horizon, prediction_data['current_price'],
+                prediction_data['predicted_price'], tick_buffer.total_ticks)
+    fig = patch_traces(entry, data_key, make_traces)
     
     st.plotly_chart(fig, use_container_width=True)
+    
+    if tick_buffer.total_ticks:
+        render_live_indicators(TickStore.open().live_indicators(asset))
+
+def render_live_indicators(latest):
+    """Render tick-level SMA/RSI kept current from the live ring buffer"""
+    st.caption(
+        f"Live mid: ${latest['price']:.2f} • SMA-20: {latest['sma_20']:.2f} • "
+        f"RSI (14 ticks): {latest['rsi']:.1f}"
+    )
+
+def build_scenario_figure():
+    """Layout and an empty bar trace for the scenario chart"""
+    fig = go.Figure(go.Bar(
+        x=SCENARIOS,
+        marker=dict(color=SCENARIO_PROBABILITIES, coloraxis='coloraxis'),
+        hovertemplate="Scenario=%{x}<br>Price=%{y}<br>Probability=%{marker.color}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="Price Scenarios & Probabilities",
+        xaxis_title="Scenario",
+        yaxis_title="Price",
+        coloraxis=dict(colorscale='RdYlGn', colorbar=dict(title="Probability")),
+        height=400
+    )
+    return fig
 
 def render_scenario_chart(prediction_data):
     """Render scenario analysis chart"""
     predicted_price = prediction_data['predicted_price']
     
-    confidence_data = {
-        'Scenario': ['Best Case', 'Most Likely', 'Worst Case'],
-        'Price': [predicted_price * 1.1, predicted_price, predicted_price * 0.9],
-        'Probability': [0.2, 0.6, 0.2]
-    }
-    
-    fig = px.bar(
-        confidence_data,
-        x='Scenario',
-        y='Price',
-        color='Probability',
-        title="Price Scenarios & Probabilities",
-        color_continuous_scale='RdYlGn'
-    )
-    
-    fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    entry = cached_figure(('scenario',), build_scenario_figure)
+    fig = patch_traces(entry, predicted_price, lambda: [
+        dict(y=(predicted_price * SCENARIO_MULTIPLIERS).astype(np.float32))
+    ])
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,39 @@
+import streamlit as st
+from collections import OrderedDict
+
+FIGURE_CACHE_SIZE = 8  # figures kept per session
+_SESSION_KEY = "_figure_cache"
+
+
+def cached_figure(layout_key, build):
+    """Session-local figure for a layout, created with ``build()`` on first use.
+
+    Figures are kept per session (Plotly figures are not thread-safe) and
+    reused across reruns, so layout and trace setup are paid once.
+    """
+    figures = st.session_state.get(_SESSION_KEY)
+    if figures is None:
+        figures = OrderedDict()
+        st.session_state[_SESSION_KEY] = figures
+
+    entry = figures.get(layout_key)
+    if entry is None:
+        entry = {'figure': build(), 'data_key': None}
+        figures[layout_key] = entry
+        while len(figures) > FIGURE_CACHE_SIZE:
+            figures.popitem(last=False)
+    else:
+        figures.move_to_end(layout_key)
+    return entry
+
+
+def patch_traces(entry, data_key, make_traces):
+    """Replace trace data with ``make_traces()``, skipped entirely when ``data_key`` is unchanged"""
+    if entry['data_key'] == data_key:
+        return entry['figure']
+    figure = entry['figure']
+    with figure.batch_update():
+        for trace, values in zip(figure.data, make_traces()):
+            trace.update(values)
+    entry['data_key'] = data_key
+    return figure
@@ -1,5 +1,9 @@
 import streamlit as st
 import numpy as np
+from config.settings import (
+    INVESTMENT_AMOUNT_DEFAULT, INVESTMENT_AMOUNT_MIN, INVESTMENT_AMOUNT_MAX, INVESTMENT_AMOUNT_STEP
+)
+from utils.indicator_engine import get_indicator_snapshot
 
 def render_metrics(prediction_data, user_inputs):
     """Render prediction results and metrics"""
@@ -11,7 +15,7 @@ def render_metrics(prediction_data, user_inputs):
     render_metrics_row(prediction_data, user_inputs)
     
     # Technical indicators
-    render_technical_indicators()
+    render_technical_indicators(user_inputs['selected_asset'])
     
     # Trading recommendation
     render_trading_recommendation(prediction_data, user_inputs)
@@ -32,20 +36,24 @@ def render_prediction_box(prediction_data, user_inputs):
         <h4>Confidence: {confidence*100:.1f}%</h4>
     </div>
     """, unsafe_allow_html=True)
+    
+    render_model_latency(prediction_data)
+
+def render_model_latency(prediction_data):
+    """Caption with each model's inference latency and any ensemble members dropped"""
+    latency_ms = prediction_data.get('model_latency_ms')
+    if not latency_ms:
+        return
+    parts = [f"{name}: {ms:.1f} ms" for name, ms in latency_ms.items()]
+    parts += [f"{name}: dropped (deadline)" for name in prediction_data.get('dropped_models', [])]
+    st.caption(f"🧠 {prediction_data.get('model_type', 'Model')} • " + " • ".join(parts))
 
 def render_metrics_row(prediction_data, user_inputs):
     """Render metrics in a row layout"""
     col1, col2, col3, col4 = st.columns(4)
     
-    predicted_change = prediction_data['predicted_change']
-    investment_amount = user_inputs['investment_amount']
-    
     with col1:
-        st.metric(
-            "Potential Profit/Loss",
-            f"${investment_amount * predicted_change:+.2f}",
-            f"{predicted_change*100:+.2f}%"
-        )
+        render_pnl_card(prediction_data)
     
     with col2:
         st.metric(
@@ -68,25 +76,63 @@ def render_metrics_row(prediction_data, user_inputs):
             f"{np.random.randint(-10, 11):+d} points"
         )
 
-def render_technical_indicators():
+@st.fragment
+def render_pnl_card(prediction_data):
+    """Render the investment input and P&L; reruns alone when the amount changes.
+    
+    Its only inputs are ``prediction_data`` (fixed for the fragment) and the
+    investment amount widget it owns. The amount itself lives in the plain
+    ``investment_amount`` session key, which outlives the widget on runs
+    where the card isn't rendered.
+    """
+    predicted_change = prediction_data['predicted_change']
+    
+    investment_amount = st.number_input(
+        "Investment Amount ($)",
+        min_value=INVESTMENT_AMOUNT_MIN,
+        max_value=INVESTMENT_AMOUNT_MAX,
+        value=st.session_state.get('investment_amount', INVESTMENT_AMOUNT_DEFAULT),
+        step=INVESTMENT_AMOUNT_STEP,
+        key="investment_amount_input",
+        on_change=save_investment_amount
+    )
+    
+    st.metric(
+        "Potential Profit/Loss",
+        f"${investment_amount * predicted_change:+.2f}",
+        f"{predicted_change*100:+.2f}%"
+    )
+    st.caption(f"Position size: {investment_amount / prediction_data['current_price']:.2f} units")
+
+def save_investment_amount():
+    """Copy the widget's value into the session key that persists it"""
+    st.session_state.investment_amount = st.session_state.investment_amount_input
+
+def render_technical_indicators(asset):
     """Render technical analysis indicators"""
     st.subheader("🔧 Technical Analysis")
     
-    tech_col1, tech_col2, tech_col3 = st.columns(3)
+    # Computed for the whole asset universe in one vectorized pass and cached
+    indicators = get_indicator_snapshot()[asset]
+    
+    tech_col1, tech_col2, tech_col3, tech_col4 = st.columns(4)
     
     with tech_col1:
-        render_rsi_indicator()
+        render_rsi_indicator(indicators)
     
     with tech_col2:
-        render_macd_indicator()
+        render_macd_indicator(indicators)
     
     with tech_col3:
-        render_ma_indicator()
+        render_ma_indicator(indicators)
+    
+    with tech_col4:
+        render_volatility_indicator(indicators)
 
-def render_rsi_indicator():
+def render_rsi_indicator(indicators):
     """Render RSI indicator"""
     st.markdown("**RSI (14)**")
-    rsi_value = np.random.uniform(20, 80)
+    rsi_value = indicators['rsi']
     if rsi_value > 70:
         st.error(f"Overbought: {rsi_value:.1f}")
     elif rsi_value < 30:
@@ -94,26 +140,50 @@ def render_rsi_indicator():
     else:
         st.info(f"Neutral: {rsi_value:.1f}")
 
-def render_macd_indicator():
+def render_macd_indicator(indicators):
     """Render MACD signal"""
     st.markdown("**MACD Signal**")
-    signals = ["Strong Buy", "Buy", "Hold", "Sell", "Strong Sell"]
-    signal = np.random.choice(signals)
+    histogram = indicators['macd_histogram']
+    macd_value = indicators['macd']
+    
+    # Ignore histogram noise below 0.1% of ATR
+    if abs(histogram) < indicators['atr'] * 0.001:
+        signal = "Hold"
+    elif histogram > 0:
+        signal = "Strong Buy" if macd_value > 0 else "Buy"
+    else:
+        signal = "Strong Sell" if macd_value < 0 else "Sell"
+    
     if "Buy" in signal:
         st.success(signal)
     elif signal == "Hold":
         st.info(signal)
     else:
         st.error(signal)
+    st.caption(f"MACD {macd_value:+.3f} • Hist {histogram:+.3f}")
 
-def render_ma_indicator():
+def render_ma_indicator(indicators):
     """Render Moving Average indicator"""
     st.markdown("**Moving Average**")
-    ma_signal = np.random.choice(["Above MA50", "Below MA50"])
-    if "Above" in ma_signal:
-        st.success(ma_signal)
+    if indicators['close'] >= indicators['sma_50']:
+        st.success("Above MA50")
+    else:
+        st.error("Below MA50")
+    
+    crossover = {1: "Last cross: golden (MA20 ↑ MA50)", -1: "Last cross: death (MA20 ↓ MA50)"}
+    st.caption(crossover.get(int(indicators['last_crossover']), "No recent MA crossover"))
+
+def render_volatility_indicator(indicators):
+    """Render Bollinger band position and ATR"""
+    st.markdown("**Bollinger / ATR**")
+    percent_b = indicators['bollinger_percent_b']
+    if percent_b > 1:
+        st.error(f"Above upper band ({percent_b:.2f})")
+    elif percent_b < 0:
+        st.success(f"Below lower band ({percent_b:.2f})")
     else:
-        st.error(ma_signal)
+        st.info(f"Inside bands ({percent_b:.2f})")
+    st.caption(f"ATR (14): {indicators['atr']:.2f} ({indicators['atr_percent']*100:.2f}%)")
 
 def render_trading_recommendation(prediction_data, user_inputs):
     """Render trading recommendation section"""
@@ -121,14 +191,12 @@ def render_trading_recommendation(prediction_data, user_inputs):
     
     current_price = prediction_data['current_price']
     predicted_price = prediction_data['predicted_price']
-    investment_amount = user_inputs['investment_amount']
     
     recommendations = {
         "action": np.random.choice(["BUY", "SELL", "HOLD"]),
         "entry_price": f"${current_price:.2f}",
         "target_price": f"${predicted_price:.2f}",
-        "stop_loss": f"${current_price * 0.95:.2f}",
-        "position_size": f"{investment_amount / current_price:.2f} units"
+        "stop_loss": f"${current_price * 0.95:.2f}"
     }
     
     rec_col1, rec_col2 = st.columns(2)
@@ -145,7 +213,6 @@ def render_trading_recommendation(prediction_data, user_inputs):
     with rec_col2:
         st.markdown(f"""
         ### 📋 **Trade Details**
-        - **Position Size:** {recommendations["position_size"]}
         - **Risk/Reward Ratio:** 1:2.5
         - **Timeframe:** {user_inputs['prediction_horizon']}
         """)
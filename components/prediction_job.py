@@ -0,0 +1,47 @@
+import uuid
+import streamlit as st
+from config.settings import PREDICTION_JOB_POLL_INTERVAL
+
+def submit_prediction_job(jobs, user_inputs):
+    """Queue a background prediction for this session, releasing any job it replaces"""
+    # Identifies this session to the job pool, so resubmitting joins a job only once
+    holder = st.session_state.setdefault('prediction_job_holder', uuid.uuid4().hex)
+    previous = st.session_state.get('prediction_job_id')
+    job_id = jobs.submit(user_inputs, holder)
+    if previous is not None and previous != job_id:
+        jobs.release(previous, holder)
+    st.session_state.prediction_job_id = job_id
+    st.session_state.prediction_job_inputs = user_inputs
+
+def render_prediction_job(jobs):
+    """Show the outcome of the last job, or poll the pending one"""
+    notice = st.session_state.pop('prediction_job_notice', None)
+    if notice is not None:
+        st.error(notice)
+
+    if st.session_state.get('prediction_job_id') is not None:
+        poll_prediction_job(jobs)
+
+@st.fragment(run_every=PREDICTION_JOB_POLL_INTERVAL)
+def poll_prediction_job(jobs):
+    """Progress of the session's job; reruns alone until the result lands, then reruns the app"""
+    job_id = st.session_state.get('prediction_job_id')
+    if job_id is None:
+        return
+    status = jobs.status(job_id)
+
+    if status is None or status['state'] in ('failed', 'cancelled'):
+        st.session_state.prediction_job_notice = (
+            status['error'] if status is not None and status['error']
+            else "The prediction was cancelled. Please try again."
+        )
+        del st.session_state['prediction_job_id']
+        st.rerun()
+
+    if status['state'] == 'done':
+        st.session_state.prediction_data = status['result']
+        st.session_state.user_inputs = st.session_state.pop('prediction_job_inputs')
+        del st.session_state['prediction_job_id']
+        st.rerun()
+
+    st.progress(int(status['progress'] * 100), text=status['message'])
@@ -0,0 +1,40 @@
+import streamlit as st
+import pandas as pd
+from config.settings import MARKET_OPTIONS, PREDICTION_HORIZONS
+from services.ai_predictor import AIPredictor, build_universe_requests
+from services.service_container import get_services
+
+def render_market_screener():
+    """Render predictions for every asset in MARKET_OPTIONS, scored in one batch"""
+    st.subheader("📊 Market Overview")
+    
+    horizon = st.selectbox("Screener Horizon", PREDICTION_HORIZONS, key="screener_horizon")
+    results = AIPredictor.predict_batch(
+        build_universe_requests([horizon]), model_runner=get_services().get("model_runner")
+    )
+    
+    market_of = {asset: market for market, assets in MARKET_OPTIONS.items() for asset in assets}
+    df = pd.DataFrame({
+        'Market': [market_of[asset] for asset in results['selected_asset']],
+        'Asset': results['selected_asset'],
+        'Current Price': results['current_price'],
+        'Predicted Price': results['predicted_price'],
+        'Expected Change (%)': results['predicted_change'] * 100,
+        'Confidence (%)': results['confidence'] * 100
+    }).sort_values('Expected Change (%)', ascending=False)
+    
+    st.dataframe(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Current Price': st.column_config.NumberColumn(format="$%.2f"),
+            'Predicted Price': st.column_config.NumberColumn(format="$%.2f"),
+            'Expected Change (%)': st.column_config.NumberColumn(format="%+.2f"),
+            'Confidence (%)': st.column_config.NumberColumn(format="%.1f")
+        }
+    )
+    
+    if st.button("Close Market Overview"):
+        st.session_state.show_market_overview = False
+        st.rerun()
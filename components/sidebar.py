@@ -1,5 +1,8 @@
 import streamlit as st
-from config.settings import MARKET_OPTIONS, AI_MODELS, RISK_LEVELS, PREDICTION_HORIZONS
+from config.settings import (
+    MARKET_OPTIONS, AI_MODELS, RISK_LEVELS, PREDICTION_HORIZONS, INVESTMENT_AMOUNT_DEFAULT
+)
+from config.theme_settings import THEMES
 from components.user_dashboard import UserDashboard
 
 def render_sidebar():
@@ -23,13 +26,8 @@ def render_sidebar():
     # Trading parameters
     prediction_horizon = st.sidebar.selectbox("Prediction Horizon", PREDICTION_HORIZONS)
     
-    investment_amount = st.sidebar.number_input(
-        "Investment Amount ($)",
-        min_value=100,
-        max_value=100000,
-        value=1000,
-        step=100
-    )
+    # Edited on the P&L card, which reruns on its own without the rest of the page
+    investment_amount = st.session_state.get('investment_amount', INVESTMENT_AMOUNT_DEFAULT)
     
     risk_level = st.sidebar.select_slider("Risk Tolerance", options=RISK_LEVELS, value="Medium")
     
@@ -70,10 +68,13 @@ def render_additional_features():
     st.sidebar.markdown("### 🛠️ Additional Features")
     
     if st.sidebar.button("📊 Market Overview"):
-        st.sidebar.info("Market overview feature coming soon!")
+        st.session_state.show_market_overview = True
     
     if st.sidebar.button("📈 Backtesting"):
-        st.sidebar.info("Backtesting module in development!")
+        st.session_state.show_backtest = True
+    
+    # Applied by load_custom_css as a CSS variables swap on the next run
+    st.sidebar.selectbox("🎨 Theme", list(THEMES), key="theme")
     
     if st.sidebar.button("⚙️ Model Settings"):
         st.sidebar.info("Advanced settings panel coming soon!")
@@ -1,11 +1,9 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-from utils.user_database import UserDatabase
 
 class UserDashboard:
-    def __init__(self):
-        self.user_db = UserDatabase()
+    def __init__(self, user_db):
+        self.user_db = user_db
     
     def render_user_profile(self):
         """Render user profile section"""
@@ -39,6 +37,9 @@ class UserDashboard:
         activities = self.user_db.get_user_activities(username, limit=20)
         
         if activities:
+            # pandas is imported on first use so the login page loads without it
+            import pandas as pd
+            
             # Convert to DataFrame for better display
             df_activities = pd.DataFrame(activities)
             df_activities['timestamp'] = pd.to_datetime(df_activities['timestamp'])
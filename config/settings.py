@@ -18,3 +18,111 @@ AI_MODELS = ["LSTM Neural Network", "Random Forest", "XGBoost", "Ensemble Model"
 RISK_LEVELS = ["Very Low", "Low", "Medium", "High", "Very High"]
 
 PREDICTION_HORIZONS = ["1 Hour", "4 Hours", "1 Day", "1 Week", "1 Month"]
+
+# User storage: "json" (data/users.json + activity journal) or "sqlite"
+STORAGE_BACKEND = "json"
+SQLITE_DATABASE_PATH = "data/users.db"
+
+# Background activity writer
+ACTIVITY_QUEUE_SIZE = 10000
+ACTIVITY_BATCH_SIZE = 200
+ACTIVITY_FLUSH_INTERVAL = 0.5  # seconds
+ACTIVITY_ENQUEUE_TIMEOUT = 0.05  # seconds to wait on a full queue before writing inline
+ACTIVITY_FLUSH_RETRIES = 3  # batch retries (with doubling backoff) before writing per record
+ACTIVITY_RETRY_BACKOFF = 0.1  # seconds before the first retry
+
+# User record cache in front of UserDatabase lookups
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 300  # seconds
+
+# Shared prediction cache: TTL in seconds per horizon and a memory cap
+PREDICTION_CACHE_TTL = {
+    "1 Hour": 60,
+    "4 Hours": 240,
+    "1 Day": 900,
+    "1 Week": 3600,
+    "1 Month": 4 * 3600
+}
+PREDICTION_CACHE_DEFAULT_TTL = 60
+PREDICTION_CACHE_MAX_BYTES = 16 * 1024 * 1024
+PREDICTION_WAIT_TIMEOUT = 30  # seconds a caller waits on an identical in-flight prediction
+
+# Local OHLCV history store (memory-mapped columnar files per asset)
+HISTORY_DATA_DIR = "data/history"
+HISTORY_BAR_SECONDS = 3600
+HISTORY_SEED_BARS = 24 * 365  # synthetic bars written for assets with no history yet
+
+# Length of each prediction horizon in seconds
+HORIZON_SECONDS = {
+    "1 Hour": 3600,
+    "4 Hours": 4 * 3600,
+    "1 Day": 24 * 3600,
+    "1 Week": 7 * 24 * 3600,
+    "1 Month": 30 * 24 * 3600
+}
+
+# Live ticks kept in memory per asset (fixed ring buffer size)
+TICK_BUFFER_CAPACITY = 16384
+# Most ticks fed to the live indicators per read; after a longer gap they
+# restart from this many recent ticks (ample warm-up for SMA-50 and the EMAs)
+TICK_INDICATOR_WARMUP = 500
+
+# Live market feed (newline-delimited ticks over TCP)
+MARKET_FEED_ENABLED = False
+MARKET_FEED_HOST = "127.0.0.1"
+MARKET_FEED_PORT = 9100
+MARKET_FEED_BATCH_TICKS = 5000  # dispatch after this many ticks...
+MARKET_FEED_BATCH_INTERVAL = 0.1  # ...or this many seconds, whichever comes first
+MARKET_FEED_RECONNECT_MIN = 0.5  # seconds; doubles per failed attempt
+MARKET_FEED_RECONNECT_MAX = 30
+FEED_SIMULATOR_RATE = 50000  # ticks per second across all symbols
+
+# Price chart point budget: about two points per pixel of rendered width
+CHART_WIDTH_PX = 800
+CHART_POINTS_PER_PIXEL = 2
+
+# Investment amount input (edited on the P&L card next to the results)
+INVESTMENT_AMOUNT_DEFAULT = 1000
+INVESTMENT_AMOUNT_MIN = 100
+INVESTMENT_AMOUNT_MAX = 100000
+INVESTMENT_AMOUNT_STEP = 100
+
+# Import-time budget for rendering the login page (python -m utils.import_profiler --budget)
+STARTUP_IMPORT_BUDGET_MS = 1500
+
+# Walk-forward backtester (strategy from the trading recommendation)
+BACKTEST_STOP_LOSSES = (0.02, 0.05, 0.10)  # 0.05 is the recommendation's stop
+BACKTEST_MIN_EDGES = (0.0, 0.005, 0.01)  # minimum |predicted change| to open a trade
+BACKTEST_FEE = 0.0005  # per side
+BACKTEST_WINDOW_BARS = 30 * 24  # walk-forward window (at least one horizon)
+BACKTEST_ASSETS_PER_TASK = 50
+BACKTEST_WORKERS = None  # process pool size; None uses every CPU, 0 runs in-process
+
+# Model execution: "Ensemble Model" runs its members in parallel worker processes
+ENSEMBLE_WEIGHTS = {"LSTM Neural Network": 0.4, "Random Forest": 0.3, "XGBoost": 0.3}
+MODEL_DEADLINES = {"LSTM Neural Network": 1.5, "Random Forest": 1.0, "XGBoost": 1.0}  # seconds per member
+MODEL_WORKERS = None  # process pool size; None gives one per ensemble member, 0 runs in-process
+MODEL_WARMUP_TIMEOUT = 30  # seconds to wait for cold workers before deadlines apply
+
+# Model registry: artifacts under <dir>/<model>/[<market>/<horizon>/] with large weights memory-mapped
+MODEL_ARTIFACT_DIR = "data/models"
+MODEL_REGISTRY_MAX_BYTES = 512 * 1024 * 1024  # warm models kept per process (LRU)
+MODEL_MMAP_MIN_BYTES = 1024 * 1024  # weight arrays at least this large are memory-mapped
+MODEL_PREWARM = False  # load every model at server start (and in ensemble workers)
+
+# Background prediction jobs (the UI polls instead of blocking the script thread)
+PREDICTION_JOB_WORKERS = 4
+PREDICTION_JOB_POLL_INTERVAL = 0.5  # seconds between UI status checks
+PREDICTION_JOB_ABANDON_SECONDS = 30  # queued jobs nobody has polled for this long are cancelled
+PREDICTION_JOB_RESULT_TTL = 300  # finished jobs are kept this long for late polls
+
+# Prediction backend: "local" (in-process) or "http" (python -m services.prediction_server)
+PREDICTION_BACKEND = "local"
+PREDICTION_SERVER_HOST = "127.0.0.1"
+PREDICTION_SERVER_PORT = 8600
+PREDICTION_SERVER_URL = f"http://{PREDICTION_SERVER_HOST}:{PREDICTION_SERVER_PORT}"
+PREDICTION_SERVER_BATCH_WAIT_MS = 5  # collect requests this long after the first...
+PREDICTION_SERVER_MAX_BATCH = 256  # ...or until this many have arrived
+PREDICTION_SERVER_REQUEST_TIMEOUT = 10  # seconds a request waits for its batch
+PREDICTION_CLIENT_TIMEOUT = 15
+PREDICTION_CLIENT_POOL_SIZE = 8  # keep-alive connections per client
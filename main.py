@@ -1,10 +1,7 @@
 import streamlit as st
 from config.settings import PAGE_CONFIG
 from components.auth import AuthManager
-from components.sidebar import render_sidebar
-from components.charts import render_charts
-from components.metrics import render_metrics
-from services.ai_predictor import AIPredictor
+from services.service_container import get_services
 from styles.css_loader import load_custom_css  # Clean import
 from utils.session_manager import SessionManager
 
@@ -15,17 +12,36 @@ def main():
     # Load all styling (one clean import)
     load_custom_css()
     
+    # Shared services are built once per server process
+    services = get_services()
+    
     # Initialize session manager
-    session_manager = SessionManager()
+    session_manager = SessionManager(services.get("activity_writer"))
     
     # Initialize auth manager
-    auth_manager = AuthManager()
+    auth_manager = AuthManager(services.get("user_db"), services.get("activity_writer"))
     
     # Check if user is logged in
     if not st.session_state.get('logged_in', False):
         auth_manager.render_auth_page()
         return
     
+    render_trading_app(services, session_manager)
+    
+    # Professional footer
+    render_footer()
+
+def render_trading_app(services, session_manager):
+    """Render the logged-in app: header, sidebar, prediction and results"""
+    # The charting and analytics stack (plotly, pandas, numpy) is imported
+    # here so the login page renders without paying for it
+    from components.sidebar import render_sidebar
+    from components.charts import render_charts
+    from components.metrics import render_metrics
+    from components.screener import render_market_screener
+    from components.backtest import render_backtest_panel
+    from components.prediction_job import submit_prediction_job, render_prediction_job
+    
     # Main app header with user info
     render_header_with_user()
     
@@ -40,24 +56,25 @@ def main():
             # Log user activity
             session_manager.log_activity("prediction_generated", user_inputs)
             
-            # Initialize AI predictor
-            predictor = AIPredictor(user_inputs)
-            
-            # Generate prediction with progress
-            prediction_data = predictor.generate_prediction()
-            
-            # Store in session state
-            st.session_state.prediction_data = prediction_data
-            st.session_state.user_inputs = user_inputs
+            # Predict on the job pool; identical in-flight requests share one job
+            submit_prediction_job(services.get("prediction_jobs"), user_inputs)
+        
+        # Poll the pending job without blocking the page
+        render_prediction_job(services.get("prediction_jobs"))
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Whole-universe screener, scored in a single batch
+    if st.session_state.get('show_market_overview', False):
+        render_market_screener()
+    
+    # Walk-forward backtest of the recommendation strategy, run in a process pool
+    if st.session_state.get('show_backtest', False):
+        render_backtest_panel(services.get("backtester"), user_inputs)
+    
     # Display results if available
     if hasattr(st.session_state, 'prediction_data'):
         render_metrics(st.session_state.prediction_data, st.session_state.user_inputs)
         render_charts(st.session_state.prediction_data, st.session_state.user_inputs)
-    
-    # Professional footer
-    render_footer()
 
 def render_header_with_user():
     """Render professional header with user information"""
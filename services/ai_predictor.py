@@ -1,48 +1,183 @@
 import numpy as np
-import streamlit as st
 import time
+from config.settings import MARKET_OPTIONS, PREDICTION_HORIZONS
+from services.model_runner import ModelRunner, DEFAULT_MODEL
+from utils.rollup_engine import RollupEngine
+
+# Bars of the horizon's own rollup used as model input
+FEATURE_BARS = 60
+MOMENTUM_BARS = 5
+RESULT_FIELDS = ('current_price', 'predicted_price', 'predicted_change', 'confidence')
+
+
+class ProgressReporter:
+    """Forward stage progress to Streamlit widgets, throttled to a few updates"""
+
+    def __init__(self, progress_bar, status_text, min_interval=0.1):
+        self.progress_bar = progress_bar
+        self.status_text = status_text
+        self.min_interval = min_interval
+        self._last_update = 0.0
+        self._last_message = None
+
+    def __call__(self, fraction, message):
+        now = time.monotonic()
+        if fraction < 1 and message == self._last_message and now - self._last_update < self.min_interval:
+            return
+        self.progress_bar.progress(int(fraction * 100))
+        if message != self._last_message:
+            self.status_text.text(message)
+            self._last_message = message
+        self._last_update = now
+
 
 class AIPredictor:
-    def __init__(self, user_inputs):
+    def __init__(self, user_inputs, model_runner=None):
         self.user_inputs = user_inputs
-        
+        self.model_runner = model_runner
+
     def generate_prediction(self):
-        """Generate AI prediction with progress simulation"""
-        # Simulate AI processing
+        """Generate AI prediction, reporting progress from each pipeline stage"""
+        # Imported here so process-pool workers can score features without Streamlit
+        import streamlit as st
+
         progress_bar = st.progress(0)
         status_text = st.empty()
-        
-        for i in range(100):
-            progress_bar.progress(i + 1)
-            if i < 30:
-                status_text.text("Collecting market data...")
-            elif i < 60:
-                status_text.text("Running AI analysis...")
-            elif i < 90:
-                status_text.text("Calculating predictions...")
-            else:
-                status_text.text("Finalizing results...")
-            time.sleep(0.02)
-        
-        status_text.empty()
-        progress_bar.empty()
-        
-        # Generate mock prediction
-        return self._calculate_prediction()
-    
-    def _calculate_prediction(self):
-        """Calculate prediction based on user inputs"""
-        np.random.seed(42)
-        
-        # Base prediction logic (replace with actual AI model)
-        current_price = np.random.uniform(50, 200)
-        predicted_change = np.random.uniform(-0.05, 0.05)
-        predicted_price = current_price * (1 + predicted_change)
-        confidence = np.random.uniform(0.65, 0.95)
-        
+
+        try:
+            return self.predict(ProgressReporter(progress_bar, status_text))
+        finally:
+            status_text.empty()
+            progress_bar.empty()
+
+    def predict(self, progress_callback=None):
+        """Run the prediction pipeline for this predictor's inputs"""
+        results = self.predict_batch(
+            [self.user_inputs], progress_callback,
+            self.user_inputs.get('model_type', DEFAULT_MODEL), self.model_runner
+        )
+        return prediction_row(results, 0)
+
+    @classmethod
+    def predict_batch(cls, requests, progress_callback=None, model_type=DEFAULT_MODEL, model_runner=None):
+        """Score N user_inputs dicts in one vectorized pass.
+
+        Returns a struct of arrays: one length-N array per result field plus
+        the requested assets and horizons, in request order, along with the
+        model used, each model's latency and any ensemble members dropped.
+        """
+        report = progress_callback or (lambda fraction, message: None)
+        assets = np.array([request['selected_asset'] for request in requests], dtype=object)
+        horizons = np.array([request['prediction_horizon'] for request in requests], dtype=object)
+        markets = np.array([request.get('market_type') for request in requests], dtype=object)
+
+        report(0.0, "Collecting market data...")
+        market_data = cls._fetch_market_data(assets, horizons)
+
+        report(0.25, "Building features...")
+        features = cls._build_features(market_data, len(requests))
+        # Models are chosen per (market, horizon) from the registry
+        features.update(market_type=markets, prediction_horizon=horizons)
+
+        report(0.5, "Running AI analysis...")
+        raw_prediction = cls._run_inference(features, model_type, model_runner)
+
+        report(0.75, "Finalizing results...")
+        results = cls._post_process(raw_prediction, features)
+        results['selected_asset'] = assets
+        results['prediction_horizon'] = horizons
+        results['model_type'] = model_type
+        results['model_latency_ms'] = raw_prediction['model_latency_ms']
+        results['dropped_models'] = raw_prediction['dropped_models']
+
+        report(1.0, "Done")
+        return results
+
+    @classmethod
+    def score_features(cls, features):
+        """Inference and post-processing on precomputed features (used by the backtester)"""
+        return cls._post_process(cls._run_inference(features), features)
+
+    @staticmethod
+    def _fetch_market_data(assets, horizons):
+        """Recent closes from each horizon's precomputed rollup.
+
+        Returns one group per horizon: the request rows it covers, a
+        (unique assets x bars) close matrix and each row's asset index.
+        Assets with an empty series are NaN rows, so only their own
+        predictions come out NaN.
+        """
+        engine = RollupEngine.open()
+        groups = []
+        for horizon in np.unique(horizons.astype(str)):
+            rows = np.flatnonzero(horizons == horizon)
+            unique_assets, asset_index = np.unique(assets[rows].astype(str), return_inverse=True)
+            closes = [engine.series(asset, horizon, FEATURE_BARS)['close'] for asset in unique_assets]
+            lengths = [len(close) for close in closes if len(close)]
+            if not lengths:
+                # No bars for any of these assets yet: their features stay NaN
+                continue
+            # Assets without bars get a NaN row instead of failing the batch
+            bars = min(lengths)
+            prices = np.full((len(closes), bars), np.nan)
+            for i, close in enumerate(closes):
+                if len(close):
+                    prices[i] = close[len(close) - bars:]
+            groups.append((rows, prices, asset_index))
+        return groups
+
+    @staticmethod
+    def _build_features(market_data, count):
+        """Derive per-request model inputs, vectorized within each horizon group"""
+        features = {name: np.full(count, np.nan) for name in ('current_price', 'momentum', 'volatility')}
+
+        for rows, prices, asset_index in market_data:
+            returns = np.diff(prices, axis=1) / prices[:, :-1]
+            features['current_price'][rows] = prices[asset_index, -1]
+            if returns.shape[1]:
+                features['momentum'][rows] = returns[:, -MOMENTUM_BARS:].mean(axis=1)[asset_index]
+                features['volatility'][rows] = returns.std(axis=1)[asset_index]
+
+        return features
+
+    @staticmethod
+    def _run_inference(features, model_type=DEFAULT_MODEL, model_runner=None):
+        """Score the features with the selected model (or the ensemble)"""
+        # Without a shared runner the ensemble members run in-process
+        return (model_runner or ModelRunner(workers=0)).run(model_type, features)
+
+    @staticmethod
+    def _post_process(raw_prediction, features):
+        """Turn model output into the result fields consumed by the UI"""
+        current_price = features['current_price']
+        predicted_change = raw_prediction['predicted_change']
+
         return {
             'current_price': current_price,
-            'predicted_price': predicted_price,
+            'predicted_price': current_price * (1 + predicted_change),
             'predicted_change': predicted_change,
-            'confidence': confidence
-        }
\ No newline at end of file
+            'confidence': raw_prediction['confidence']
+        }
+
+
+def prediction_row(results, index):
+    """One request's prediction dict from predict_batch results"""
+    prediction = {field: float(results[field][index]) for field in RESULT_FIELDS}
+    prediction['model_type'] = results['model_type']
+    prediction['model_latency_ms'] = dict(results['model_latency_ms'])
+    prediction['dropped_models'] = list(results['dropped_models'])
+    return prediction
+
+
+def build_universe_requests(horizons=None):
+    """One request per asset in MARKET_OPTIONS for each horizon"""
+    return [
+        {
+            'market_type': market_type,
+            'selected_asset': asset,
+            'prediction_horizon': horizon
+        }
+        for horizon in (horizons or PREDICTION_HORIZONS)
+        for market_type, assets in MARKET_OPTIONS.items()
+        for asset in assets
+    ]
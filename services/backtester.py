@@ -0,0 +1,211 @@
+"""Walk-forward backtests of the recommendation strategy over stored history.
+
+The bar history is split into walk-forward windows and each (window, asset
+chunk) pair is simulated in a process-pool worker, which maps the history
+files itself so no price data is pickled. Within a window every parameter
+set is evaluated in one vectorized pass; the parameters that did best in
+one window are then traded out-of-sample in the next.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.settings import (
+    MARKET_OPTIONS, HORIZON_SECONDS, BACKTEST_STOP_LOSSES, BACKTEST_MIN_EDGES, BACKTEST_FEE,
+    BACKTEST_WINDOW_BARS, BACKTEST_ASSETS_PER_TASK, BACKTEST_WORKERS
+)
+from services.ai_predictor import AIPredictor, FEATURE_BARS, MOMENTUM_BARS
+from utils.backtest_engine import (
+    horizon_features, entry_bars, simulate_trades, trade_stats, equity_curve
+)
+from utils.history_store import HistoryStore
+
+YEAR_SECONDS = 365 * 24 * 3600
+DEFAULT_STOP_LOSS = 0.05
+DEFAULT_MIN_EDGE = 0.0
+
+
+def run_window(task):
+    """Simulate one walk-forward window for a chunk of assets (pool worker entry point)"""
+    store = HistoryStore.open(task['directory'])
+    horizon_bars = task['horizon_bars']
+    bars = task['bars']
+    warmup = task['warmup_bars']
+
+    entries = entry_bars(task['start'], task['stop'], horizon_bars, warmup, bars)
+    lo = max(0, task['start'] - warmup)
+    hi = min(bars, task['stop'] + horizon_bars)
+
+    # Assets are aligned on their last ``bars`` bars
+    columns = [store.columns(asset) for asset in task['assets']]
+    offsets = [len(column['close']) - bars for column in columns]
+    high, low, close = (
+        np.vstack([column[name][offset + lo:offset + hi] for column, offset in zip(columns, offsets)])
+        for name in ('high', 'low', 'close')
+    )
+
+    features = horizon_features(close, horizon_bars, MOMENTUM_BARS, FEATURE_BARS - 1)
+    # Score each asset with the registry's model for its market and the horizon
+    features['market_type'] = np.array(task['market_types'], dtype=object)
+    features['prediction_horizon'] = np.array([task['horizon']] * len(task['assets']), dtype=object)
+    predicted_change = AIPredictor.score_features(features)['predicted_change']
+
+    trades = simulate_trades(high, low, close, predicted_change, entries - lo, horizon_bars,
+                             task['stop_losses'], task['min_edges'], task['fee'])
+    trades['entries'] = entries
+    return trades
+
+
+class Backtester:
+    """Run walk-forward backtests in a process pool; reports are cached per store version"""
+
+    def __init__(self, store=None, workers=BACKTEST_WORKERS, window_bars=BACKTEST_WINDOW_BARS,
+                 assets_per_task=BACKTEST_ASSETS_PER_TASK, stop_losses=BACKTEST_STOP_LOSSES,
+                 min_edges=BACKTEST_MIN_EDGES, fee=BACKTEST_FEE):
+        self.store = store or HistoryStore.open()
+        self.workers = os.cpu_count() if workers is None else workers
+        self.window_bars = window_bars
+        self.assets_per_task = assets_per_task
+        self.stop_losses = tuple(stop_losses)
+        self.min_edges = tuple(min_edges)
+        self.fee = fee
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._reports = {}
+        self._reports_lock = threading.Lock()
+
+    def run(self, horizon, assets=None):
+        """Walk-forward report for a prediction horizon across ``assets`` (all by default)"""
+        assets = list(assets or [asset for market in MARKET_OPTIONS.values() for asset in market])
+        key = (tuple(assets), tuple(self.store.version(asset) for asset in assets))
+        with self._reports_lock:
+            cached = self._reports.get(horizon)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        report = self._run(horizon, assets)
+        with self._reports_lock:
+            # Only the latest store version is worth keeping per horizon
+            self._reports[horizon] = (key, report)
+        return report
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _run(self, horizon, assets):
+        started = time.perf_counter()
+        bar_seconds = self.store.bar_seconds
+        horizon_bars = max(1, HORIZON_SECONDS[horizon] // bar_seconds)
+        bars = min(self.store.version(asset) for asset in assets)
+        window = max(self.window_bars, horizon_bars)
+        windows = [(start, min(start + window, bars)) for start in range(0, bars, window)]
+        chunks = [assets[i:i + self.assets_per_task] for i in range(0, len(assets), self.assets_per_task)]
+        market_of = {asset: market for market, members in MARKET_OPTIONS.items() for asset in members}
+
+        tasks = [
+            {
+                'directory': os.path.abspath(self.store.directory),
+                'assets': chunk,
+                'market_types': [market_of.get(asset) for asset in chunk],
+                'horizon': horizon,
+                'bars': bars,
+                'start': start,
+                'stop': stop,
+                'horizon_bars': horizon_bars,
+                'warmup_bars': MOMENTUM_BARS * horizon_bars,
+                'stop_losses': self.stop_losses,
+                'min_edges': self.min_edges,
+                'fee': self.fee
+            }
+            for start, stop in windows
+            for chunk in chunks
+        ]
+        results = list(self._map(run_window, tasks))
+
+        # Reassemble: assets along axis -2 within a window, windows kept in order
+        window_trades = []
+        for w in range(len(windows)):
+            parts = results[w * len(chunks):(w + 1) * len(chunks)]
+            if len(parts[0]['entries']) == 0:
+                continue
+            window_trades.append({
+                'returns': np.concatenate([part['returns'] for part in parts], axis=-2),
+                'exits': np.concatenate([part['exits'] for part in parts], axis=-2),
+                'entries': parts[0]['entries']
+            })
+        if not window_trades:
+            raise ValueError(f"Not enough history to backtest the {horizon} horizon")
+
+        periods_per_year = YEAR_SECONDS / (horizon_bars * bar_seconds)
+        timestamps = self.store.tail(assets[0], bars)['timestamp']
+        report = self._walk_forward(window_trades, periods_per_year, timestamps, horizon_bars)
+        report.update({
+            'horizon': horizon,
+            'assets': len(assets),
+            'asset_years': len(assets) * bars * bar_seconds / YEAR_SECONDS,
+            'windows': len(window_trades),
+            'elapsed_seconds': time.perf_counter() - started
+        })
+        return report
+
+    def _walk_forward(self, window_trades, periods_per_year, timestamps, horizon_bars):
+        """Full-sample stats per parameter set plus the out-of-sample walk-forward run"""
+        params = [(stop_loss, min_edge) for stop_loss in self.stop_losses for min_edge in self.min_edges]
+        n_edges = len(self.min_edges)
+
+        # Full sample for every parameter set: (stops, edges, assets, all entries)
+        returns = np.concatenate([trades['returns'] for trades in window_trades], axis=-1)
+        exits = np.concatenate([trades['exits'] for trades in window_trades], axis=-1)
+        stats = trade_stats(returns, exits, periods_per_year)
+        param_stats = [
+            dict({name: float(values[i // n_edges, i % n_edges]) for name, values in stats.items()},
+                 stop_loss=stop_loss, min_edge=min_edge)
+            for i, (stop_loss, min_edge) in enumerate(params)
+        ]
+
+        # Out of sample: each window trades the parameters that won the previous one
+        default = (DEFAULT_STOP_LOSS, DEFAULT_MIN_EDGE)
+        chosen = params.index(default) if default in params else 0
+        selected, oos_returns, oos_exits = [], [], []
+        for trades in window_trades:
+            s, e = divmod(chosen, n_edges)
+            selected.append(params[chosen])
+            oos_returns.append(trades['returns'][s, e])
+            oos_exits.append(trades['exits'][s, e])
+
+            in_sample = trade_stats(trades['returns'], trades['exits'], periods_per_year)['total_return']
+            chosen = int(np.nanargmax(np.where(np.isnan(in_sample), -np.inf, in_sample)))
+
+        oos_returns = np.concatenate(oos_returns, axis=-1)
+        oos_exits = np.concatenate(oos_exits, axis=-1)
+        equity, drawdown = equity_curve(oos_returns.mean(axis=0))
+        exit_bars = np.concatenate([trades['entries'] for trades in window_trades]) + horizon_bars
+
+        return {
+            'param_stats': param_stats,
+            'walk_forward': {name: float(value) for name, value in
+                             trade_stats(oos_returns, oos_exits, periods_per_year).items()},
+            'selected_params': selected,
+            'timestamps': timestamps[exit_bars],
+            'equity': equity,
+            'drawdown': drawdown
+        }
+
+    def _map(self, fn, tasks):
+        """Run tasks in the process pool, or in-process when workers is 0"""
+        if self.workers == 0 or len(tasks) == 1:
+            return map(fn, tasks)
+        with self._executor_lock:
+            if self._executor is None:
+                # Spawned workers don't inherit the server's threads or locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            executor = self._executor
+        return executor.map(fn, tasks)
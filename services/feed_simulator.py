@@ -0,0 +1,147 @@
+"""Local stand-in for the market feed, for offline development and load tests.
+
+Generates random-walk ticks for every symbol in MARKET_OPTIONS, starting
+from each asset's last stored close, and streams them to every connected
+client in the wire format read by services.market_feed.
+
+Usage: python -m services.feed_simulator [--rate 50000] [--port 9100]
+Then set MARKET_FEED_ENABLED = True in config/settings.py.
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+from config.settings import MARKET_OPTIONS, MARKET_FEED_HOST, MARKET_FEED_PORT, FEED_SIMULATOR_RATE
+from services.market_feed import format_ticks
+from utils.history_store import HistoryStore
+
+SEND_INTERVAL = 0.01  # seconds between writes to each client
+TICK_VOLATILITY = 0.00005
+SPREAD = 0.0001
+
+
+class TickGenerator:
+    """Random-walk bid/ask ticks spread round-robin across symbols"""
+
+    def __init__(self, symbols, start_prices, seed=None):
+        self.symbols = list(symbols)
+        self.prices = np.asarray([start_prices[symbol] for symbol in self.symbols], dtype=np.float64)
+        self.rng = np.random.default_rng(seed)
+        self._carry = 0.0
+
+    def generate(self, count, now=None):
+        """Encoded wire lines for ``count`` ticks ending at ``now``"""
+        now = time.time() if now is None else now
+        per_symbol, extra = divmod(count, len(self.symbols))
+        chunks = []
+        for i, symbol in enumerate(self.symbols):
+            n = per_symbol + (1 if i < extra else 0)
+            if n == 0:
+                continue
+            steps = self.rng.normal(0, TICK_VOLATILITY, n)
+            mids = self.prices[i] * np.exp(np.cumsum(steps))
+            self.prices[i] = mids[-1]
+            half_spread = mids * SPREAD / 2
+            timestamps = now - SEND_INTERVAL * (1 - np.arange(1, n + 1) / n)
+            volumes = self.rng.lognormal(0, 1, n)
+            chunks.append(format_ticks(symbol, timestamps, mids - half_spread, mids + half_spread, volumes))
+        return ''.join(chunks)
+
+    def due(self, rate, elapsed):
+        """Whole ticks owed after ``elapsed`` seconds at ``rate`` per second"""
+        owed = rate * elapsed + self._carry
+        count = int(owed)
+        self._carry = owed - count
+        return count
+
+
+def start_prices(symbols, store=None):
+    """Last stored close per symbol, so live ticks continue the history"""
+    store = store or HistoryStore.open()
+    return {symbol: float(store.tail(symbol, 1)['close'][-1]) for symbol in symbols}
+
+
+class FeedSimulator:
+    """Asyncio TCP server streaming generated ticks at a fixed total rate"""
+
+    def __init__(self, host=MARKET_FEED_HOST, port=MARKET_FEED_PORT, rate=FEED_SIMULATOR_RATE,
+                 symbols=None, prices=None, seed=None):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.symbols = symbols or [symbol for assets in MARKET_OPTIONS.values() for symbol in assets]
+        self.prices = prices or start_prices(self.symbols)
+        self.seed = seed
+        self.sent = 0
+        self._server = None
+
+    async def start(self):
+        """Start listening; returns the bound port"""
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        """Start and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting clients and close the listener"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        """Stream ticks to one client until it disconnects"""
+        generator = TickGenerator(self.symbols, self.prices, self.seed)
+        last = time.monotonic()
+        try:
+            while True:
+                await asyncio.sleep(SEND_INTERVAL)
+                now = time.monotonic()
+                count = generator.due(self.rate, now - last)
+                last = now
+                if count:
+                    writer.write(generator.generate(count).encode('utf-8'))
+                    # Slow clients push back here instead of growing the buffer
+                    await writer.drain()
+                    self.sent += count
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _run(args):
+    simulator = FeedSimulator(args.host, args.port, args.rate)
+    port = await simulator.start()
+    print(f"Streaming {args.rate} ticks/s for {len(simulator.symbols)} symbols on {args.host}:{port}")
+    started = time.monotonic()
+    serve = asyncio.ensure_future(simulator.serve_forever())
+    try:
+        while True:
+            await asyncio.sleep(5)
+            elapsed = time.monotonic() - started
+            print(f"{simulator.sent} ticks sent ({simulator.sent / elapsed:,.0f}/s)")
+    finally:
+        serve.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve simulated ticks for every symbol")
+    parser.add_argument("--host", default=MARKET_FEED_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=MARKET_FEED_PORT, help="Port to listen on")
+    parser.add_argument("--rate", type=int, default=FEED_SIMULATOR_RATE,
+                        help="Total ticks per second across all symbols")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
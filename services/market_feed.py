@@ -0,0 +1,232 @@
+"""Asyncio ingestion of a live tick stream into the in-process stores.
+
+The feed speaks newline-delimited text over TCP, one tick per line:
+
+    SYMBOL,timestamp,bid,ask,volume
+
+``MarketFeedIngestor`` runs its own event loop on a daemon thread, so
+Streamlit script threads never wait on the socket. Ticks are parsed in
+batches and fanned out to the TickStore and the RollupEngine.
+"""
+import asyncio
+import random
+import threading
+import time
+import numpy as np
+from config.settings import (
+    MARKET_FEED_HOST, MARKET_FEED_PORT, MARKET_FEED_BATCH_TICKS, MARKET_FEED_BATCH_INTERVAL,
+    MARKET_FEED_RECONNECT_MIN, MARKET_FEED_RECONNECT_MAX
+)
+
+READ_CHUNK_BYTES = 1 << 16
+
+
+def format_ticks(symbol, timestamps, bids, asks, volumes):
+    """Encode ticks for one symbol as wire lines"""
+    return ''.join(
+        f"{symbol},{t:.6f},{b:.6f},{a:.6f},{v:.4f}\n"
+        for t, b, a, v in zip(timestamps.tolist(), bids.tolist(), asks.tolist(), volumes.tolist())
+    )
+
+
+def parse_ticks(lines):
+    """Group wire lines into per-symbol (n, 4) arrays; returns (batches, bad line count)"""
+    grouped = {}
+    for line in lines:
+        symbol, _, values = line.partition(',')
+        grouped.setdefault(symbol, []).append(values)
+
+    batches = {}
+    errors = 0
+    for symbol, rows in grouped.items():
+        try:
+            # One split/convert for the whole group is much faster than per line,
+            # but only sound when every row has exactly four fields
+            if not all(row.count(',') == 3 for row in rows):
+                raise ValueError(symbol)
+            batches[symbol] = np.array(','.join(rows).split(','), dtype=np.float64).reshape(-1, 4)
+        except ValueError:
+            good = []
+            for row in rows:
+                fields = row.split(',')
+                try:
+                    if len(fields) != 4:
+                        raise ValueError(row)
+                    good.append([float(field) for field in fields])
+                except ValueError:
+                    errors += 1
+            if good:
+                batches[symbol] = np.array(good, dtype=np.float64)
+    return batches, errors
+
+
+class MarketFeedIngestor:
+    """Subscribe to the tick feed and keep the live stores current.
+
+    Reconnects with exponential backoff (with jitter) whenever the
+    connection drops. Ticks are dispatched once ``batch_ticks`` have been
+    read or ``batch_interval`` seconds have passed, whichever comes first.
+    The ingestor thread is the only writer to the TickStore buffers.
+    """
+
+    def __init__(self, tick_store, rollup_engine=None, host=MARKET_FEED_HOST,
+                 port=MARKET_FEED_PORT, batch_ticks=MARKET_FEED_BATCH_TICKS,
+                 batch_interval=MARKET_FEED_BATCH_INTERVAL,
+                 reconnect_min=MARKET_FEED_RECONNECT_MIN, reconnect_max=MARKET_FEED_RECONNECT_MAX):
+        self.tick_store = tick_store
+        self.rollup_engine = rollup_engine
+        self.host = host
+        self.port = port
+        self.batch_ticks = batch_ticks
+        self.batch_interval = batch_interval
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self._known_assets = set(tick_store.assets())
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'connected': False,
+            'connects': 0,
+            'ticks': 0,
+            'batches': 0,
+            'parse_errors': 0,
+            'unknown_symbol_ticks': 0,
+            'last_tick_time': None,
+            'last_error': None
+        }
+
+    def start(self):
+        """Start the event loop thread (no-op if already running)"""
+        if self.running:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,),
+                                        name="market-feed", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout=5):
+        """Close the connection and stop the event loop thread"""
+        if self._thread is None:
+            return
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(task.cancel)
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        """Whether the ingestor thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self):
+        """Connection and throughput counters"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _run(self, ready):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        self._task = loop.create_task(self._main())
+        ready.set()
+        try:
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._update(connected=False)
+            loop.close()
+
+    async def _main(self):
+        """Connect, consume and reconnect until cancelled"""
+        attempt = 0
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                self._update(last_error=str(e))
+            else:
+                attempt = 0
+                with self._stats_lock:
+                    self._stats['connected'] = True
+                    self._stats['connects'] += 1
+                try:
+                    await self._consume(reader)
+                except OSError as e:
+                    self._update(last_error=str(e))
+                except Exception as e:
+                    # A bad batch or a store error must not end ingestion; the
+                    # stream is reconnected (CancelledError isn't an Exception)
+                    self._update(last_error=f"{type(e).__name__}: {e}")
+                finally:
+                    self._update(connected=False)
+                    writer.close()
+
+            delay = min(self.reconnect_max, self.reconnect_min * 2 ** attempt)
+            attempt += 1
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _consume(self, reader):
+        """Read the stream and dispatch ticks in batches until it closes"""
+        remainder = ''
+        pending = []
+        deadline = time.monotonic() + self.batch_interval
+        try:
+            while True:
+                try:
+                    # Cancelling a pending read loses no data; it stays buffered
+                    chunk = await asyncio.wait_for(reader.read(READ_CHUNK_BYTES),
+                                                   max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    chunk = None
+
+                if chunk is not None:
+                    if not chunk:
+                        self._update(last_error="Feed closed the connection")
+                        return
+                    lines = (remainder + chunk.decode('utf-8', errors='replace')).split('\n')
+                    remainder = lines.pop()
+                    pending.extend(lines)
+
+                if len(pending) >= self.batch_ticks or time.monotonic() >= deadline:
+                    if pending:
+                        # Taken off pending first: a batch that fails partway
+                        # must not be re-applied by the finally below
+                        batch, pending = pending, []
+                        self._dispatch(batch)
+                    deadline = time.monotonic() + self.batch_interval
+        finally:
+            if pending:
+                self._dispatch(pending)
+
+    def _dispatch(self, lines):
+        """Fan a batch of parsed ticks out to the stores"""
+        batches, errors = parse_ticks(line for line in lines if line)
+        ticks = 0
+        unknown = 0
+        latest = None
+        for symbol, rows in batches.items():
+            if symbol not in self._known_assets:
+                unknown += len(rows)
+                continue
+            timestamps, bids, asks, volumes = rows.T
+            self.tick_store.append_many(symbol, timestamps, bids, asks, volumes)
+            if self.rollup_engine is not None:
+                self.rollup_engine.ingest_ticks(symbol, timestamps, (bids + asks) / 2, volumes)
+            ticks += len(rows)
+            latest = max(latest or 0.0, float(timestamps[-1]))
+
+        with self._stats_lock:
+            self._stats['ticks'] += ticks
+            self._stats['batches'] += 1
+            self._stats['parse_errors'] += errors
+            self._stats['unknown_symbol_ticks'] += unknown
+            if latest is not None:
+                self._stats['last_tick_time'] = latest
+
+    def _update(self, **values):
+        with self._stats_lock:
+            self._stats.update(values)
@@ -0,0 +1,214 @@
+"""Process-wide registry of model artifacts keyed by (model_type, market_type, horizon).
+
+An artifact is a directory holding ``manifest.json`` (scalar parameters and
+the weight files it lists) plus one ``.npy`` file per weight array. A key
+resolves to ``<dir>/<model>/<market>/<horizon>/``, then to the model-wide
+``<dir>/<model>/default/``; with neither the model runs on its built-in
+parameters. Each key directory keeps immutable versions (``v-*/``) and a
+``CURRENT`` pointer file naming the live one, so publishing a new version
+is a single atomic ``os.replace``. Arrays of at least ``mmap_min_bytes`` are memory-mapped
+read-only, so every process serving a model shares one copy of its pages
+through the OS page cache.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from config.settings import (
+    MARKET_OPTIONS, PREDICTION_HORIZONS, MODEL_ARTIFACT_DIR, MODEL_REGISTRY_MAX_BYTES,
+    MODEL_MMAP_MIN_BYTES
+)
+from services.single_flight import SingleFlight
+from utils.history_store import asset_slug
+
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+VERSION_PREFIX = "v-"
+DEFAULT_ARTIFACT = "default"
+# Re-resolutions of CURRENT when the version being read is removed underneath
+LOAD_ATTEMPTS = 3
+
+
+class ModelArtifact:
+    """A loaded model: its key, scalar parameters and weight arrays"""
+
+    def __init__(self, key, params=None, arrays=None, path=None):
+        self.key = key
+        self.params = params or {}
+        self.arrays = arrays or {}
+        self.path = path
+        # Mapped arrays count at full size, though their pages are shared and reclaimable
+        self.nbytes = sum(array.nbytes for array in self.arrays.values())
+
+
+def artifact_path(directory, model_type, market_type=None, horizon=None):
+    """Artifact directory for a key; without market and horizon, the model-wide default"""
+    if market_type is None or horizon is None:
+        return os.path.join(directory, asset_slug(model_type), DEFAULT_ARTIFACT)
+    return os.path.join(directory, asset_slug(model_type), asset_slug(market_type), asset_slug(horizon))
+
+
+def current_version(path):
+    """Directory of the live version of the artifact at ``path``, or None if there is none"""
+    try:
+        with open(os.path.join(path, CURRENT), 'r', encoding='utf-8') as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(path, version)
+
+
+def save_artifact(directory, model_type, params, arrays, market_type=None, horizon=None):
+    """Publish a new version of an artifact atomically and return its directory"""
+    path = artifact_path(directory, model_type, market_type, horizon)
+    os.makedirs(path, exist_ok=True)
+
+    # Versions are written once and never modified; CURRENT isn't pointed at
+    # this one until every file is complete
+    tmp_dir = tempfile.mkdtemp(prefix=VERSION_PREFIX, dir=path)
+    manifest = {'model_type': model_type, 'market_type': market_type, 'horizon': horizon,
+                'params': params, 'arrays': {}}
+    for name, array in arrays.items():
+        filename = f"{asset_slug(name)}.npy"
+        np.save(os.path.join(tmp_dir, filename), np.ascontiguousarray(array))
+        manifest['arrays'][name] = filename
+    with open(os.path.join(tmp_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = current_version(path)
+    pointer_tmp = os.path.join(path, f".{CURRENT}-{os.path.basename(tmp_dir)}")
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(tmp_dir))
+    os.replace(pointer_tmp, os.path.join(path, CURRENT))
+
+    # Keep the version just replaced, so a reader that resolved CURRENT
+    # before the swap can still open its files; anything older goes.
+    # Processes mapping removed files keep their pages until they reload.
+    keep = {os.path.basename(tmp_dir)} | ({os.path.basename(previous)} if previous else set())
+    for name in os.listdir(path):
+        if name.startswith(VERSION_PREFIX) and name not in keep:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+    return tmp_dir
+
+
+def prewarm_keys(model_types):
+    """Every (model_type, market_type, horizon) the app can request"""
+    return [
+        (model_type, market_type, horizon)
+        for model_type in model_types
+        for market_type in MARKET_OPTIONS
+        for horizon in PREDICTION_HORIZONS
+    ]
+
+
+class ModelRegistry:
+    """Lazily loaded models shared by all sessions of a process.
+
+    Models load on first request and stay warm in an LRU; the least
+    recently used are evicted once their weights pass ``max_bytes``.
+    Concurrent requests for a cold model share a single load.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory=MODEL_ARTIFACT_DIR, max_bytes=MODEL_REGISTRY_MAX_BYTES,
+                 mmap_min_bytes=MODEL_MMAP_MIN_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mmap_min_bytes = mmap_min_bytes
+        self.single_flight = SingleFlight()
+        self._models = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'evictions': 0}
+
+    @classmethod
+    def open(cls, directory=MODEL_ARTIFACT_DIR, **kwargs):
+        """Return the process-wide registry for a directory"""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            registry = cls._instances.get(key)
+            if registry is None:
+                registry = cls(directory, **kwargs)
+                cls._instances[key] = registry
+            return registry
+
+    def get(self, model_type, market_type=None, horizon=None):
+        """The warm model for a key, loading it on first use"""
+        key = (model_type, market_type, horizon)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self._stats['hits'] += 1
+                return model
+            self._stats['misses'] += 1
+        return self.single_flight.do(key, lambda: self._put(key, self._load(key)))
+
+    def prewarm(self, keys):
+        """Load the given keys now (e.g. at server start) and return the stats"""
+        for key in keys:
+            self.get(*key)
+        return self.stats()
+
+    def clear(self):
+        """Drop every warm model so re-exported artifacts are picked up"""
+        with self._lock:
+            self._models.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hits, misses, loads, evictions and the warm models' footprint"""
+        with self._lock:
+            return dict(self._stats, models=len(self._models), bytes=self._bytes)
+
+    def _load(self, key):
+        """Read a key's artifact, falling back to the model-wide one, then to built-ins"""
+        model_type, market_type, horizon = key
+        for attempt in range(LOAD_ATTEMPTS):
+            for path in (artifact_path(self.directory, model_type, market_type, horizon),
+                         artifact_path(self.directory, model_type)):
+                path = current_version(path)
+                if path is not None:
+                    break
+            else:
+                return ModelArtifact(key)
+            try:
+                params, arrays = self._read_version(path)
+            except FileNotFoundError:
+                # Superseded twice while we read it; resolve CURRENT again
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+                continue
+            with self._lock:
+                self._stats['loads'] += 1
+            return ModelArtifact(key, params, arrays, path)
+
+    def _read_version(self, path):
+        """Parameters and weight arrays of one artifact version"""
+        with open(os.path.join(path, MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        arrays = {}
+        for name, filename in manifest.get('arrays', {}).items():
+            array_path = os.path.join(path, filename)
+            # Large weights are mapped rather than read: pages load on first touch
+            mmap_mode = 'r' if os.path.getsize(array_path) >= self.mmap_min_bytes else None
+            arrays[name] = np.load(array_path, mmap_mode=mmap_mode)
+        return manifest.get('params', {}), arrays
+
+    def _put(self, key, model):
+        """Add a loaded model and evict the least recently used past the cap"""
+        with self._lock:
+            if key in self._models:
+                self._bytes -= self._models.pop(key).nbytes
+            self._models[key] = model
+            self._bytes += model.nbytes
+            while self._bytes > self.max_bytes and len(self._models) > 1:
+                _, oldest = self._models.popitem(last=False)
+                self._bytes -= oldest.nbytes
+                self._stats['evictions'] += 1
+        return model
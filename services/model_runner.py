@@ -0,0 +1,285 @@
+"""Model execution layer: runs the model behind each ``AI_MODELS`` option.
+
+Parameters and weights come from the process's ModelRegistry, per market
+and horizon. A single model is scored in-process. "Ensemble Model" submits
+each member to a process pool so their CPU-bound inference runs on
+separate cores instead of queueing behind the GIL. Each member has its own deadline,
+counted from when it starts running; a member that misses it is dropped
+and the rest are combined by their renormalized weights. A pool broken by
+a dead worker is discarded and rebuilt on the next ensemble request.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from config.settings import (
+    AI_MODELS, ENSEMBLE_WEIGHTS, MODEL_DEADLINES, MODEL_WORKERS, MODEL_WARMUP_TIMEOUT, MODEL_PREWARM
+)
+from services.model_registry import ModelRegistry, prewarm_keys
+
+ENSEMBLE_MODEL = "Ensemble Model"
+DEFAULT_MODEL = AI_MODELS[0]
+DEFAULT_DEADLINE = 1.0
+# How often to check whether queued members have started (their deadlines run from then)
+START_POLL_SECONDS = 0.005
+MAX_PREDICTED_CHANGE = 0.05
+CONFIDENCE_RANGE = (0.65, 0.95)
+
+
+# Placeholder models until trained ones are wired in. Features are per
+# horizon bar, so one bar ahead is the horizon's prediction.
+
+def trend_inference(features, params, arrays):
+    """Momentum, scaled and damped by volatility; confidence falls as volatility rises"""
+    momentum = np.nan_to_num(features['momentum'])
+    volatility = np.nan_to_num(features['volatility'])
+    predicted_change = momentum * params['momentum_scale'] / (1 + volatility * params['volatility_damping'])
+    return {
+        'predicted_change': np.clip(predicted_change, -MAX_PREDICTED_CHANGE, MAX_PREDICTED_CHANGE),
+        'confidence': np.clip(CONFIDENCE_RANGE[1] - volatility * params['confidence_penalty'],
+                              *CONFIDENCE_RANGE)
+    }
+
+
+MODELS = {
+    "LSTM Neural Network": trend_inference,
+    "Random Forest": trend_inference,
+    "XGBoost": trend_inference
+}
+
+# Built-in parameters, overridden by the registry's artifact when one exists
+MODEL_DEFAULTS = {
+    "LSTM Neural Network": {'momentum_scale': 1.0, 'volatility_damping': 0.0, 'confidence_penalty': 2.0},
+    "Random Forest": {'momentum_scale': 0.5, 'volatility_damping': 0.0, 'confidence_penalty': 3.0},
+    "XGBoost": {'momentum_scale': 1.0, 'volatility_damping': 10.0, 'confidence_penalty': 1.0}
+}
+
+
+def _score(name, model, features):
+    """Score features with a registry model"""
+    return MODELS[name](features, dict(MODEL_DEFAULTS[name], **model.params), model.arrays)
+
+
+def run_model(name, features):
+    """Score features with one model (pool worker entry point).
+
+    Rows use the registry's model for their market_type and
+    prediction_horizon; without those columns the model-wide one is used.
+    """
+    registry = ModelRegistry.open()
+    markets = features.get('market_type')
+    horizons = features.get('prediction_horizon')
+    if markets is None or horizons is None:
+        return _score(name, registry.get(name), features)
+
+    groups = {}
+    for row, key in enumerate(zip(markets, horizons)):
+        groups.setdefault(key, []).append(row)
+    if len(groups) == 1:
+        return _score(name, registry.get(name, *next(iter(groups))), features)
+
+    results = {}
+    for (market_type, horizon), rows in groups.items():
+        rows = np.array(rows)
+        raw = _score(name, registry.get(name, market_type, horizon),
+                     {field: values[rows] for field, values in features.items()})
+        for field, values in raw.items():
+            if field not in results:
+                results[field] = np.empty((len(markets),) + values.shape[1:], dtype=values.dtype)
+            results[field][rows] = values
+    return results
+
+
+def combine(raw_predictions, weights):
+    """Weighted mean of member predictions, with weights renormalized over ``raw_predictions``"""
+    total = sum(weights[name] for name in raw_predictions)
+    return {
+        field: sum(weights[name] / total * raw[field] for name, raw in raw_predictions.items())
+        for field in ('predicted_change', 'confidence')
+    }
+
+
+def _warm_worker():
+    """Start up a cold worker process, loading every model when pre-warming is on"""
+    if MODEL_PREWARM:
+        ModelRegistry.open().prewarm(prewarm_keys(MODELS))
+    return True
+
+
+class ModelRunner:
+    """Score features with a model or the ensemble; ensemble members run in worker processes"""
+
+    def __init__(self, workers=MODEL_WORKERS, weights=ENSEMBLE_WEIGHTS, deadlines=MODEL_DEADLINES,
+                 warmup_timeout=MODEL_WARMUP_TIMEOUT):
+        self.weights = dict(weights)
+        self.deadlines = dict(deadlines)
+        self.workers = len(self.weights) if workers is None else workers
+        self.warmup_timeout = warmup_timeout
+        self._executor = None
+        self._warmup = []
+        self._lock = threading.Lock()
+        # Unfinished pool tasks in submission order; the pool hands them to
+        # workers FIFO, so the first ``workers`` of them are the ones running
+        self._in_pool = []
+        self._pool_lock = threading.Lock()
+        self._stats = {'ensemble_runs': 0, 'dropped_members': 0}
+
+    def start(self):
+        """Spawn the worker processes now rather than on the first ensemble request"""
+        self._get_executor()
+        return self
+
+    def run(self, model_type, features):
+        """Raw prediction for ``model_type`` plus per-model latency and the members dropped.
+
+        Returns {'predicted_change', 'confidence', 'model_latency_ms',
+        'dropped_models'}. Raises TimeoutError if no ensemble member makes
+        its deadline.
+        """
+        if model_type != ENSEMBLE_MODEL:
+            started = time.perf_counter()
+            raw = run_model(model_type if model_type in MODELS else DEFAULT_MODEL, features)
+            return dict(raw, model_latency_ms={model_type: (time.perf_counter() - started) * 1000},
+                        dropped_models=[])
+        if self.workers == 0:
+            return self._run_inline(features)
+        return self._run_parallel(features)
+
+    def stats(self):
+        """Ensemble runs and members dropped for missing their deadline"""
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        """Stop the worker processes, abandoning members still running"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run_inline(self, features):
+        """Run members one after another in this process (no deadlines)"""
+        raw_predictions, latency_ms = {}, {}
+        for name in self.weights:
+            started = time.perf_counter()
+            raw_predictions[name] = run_model(name, features)
+            latency_ms[name] = (time.perf_counter() - started) * 1000
+        return dict(combine(raw_predictions, self.weights), model_latency_ms=latency_ms,
+                    dropped_models=[])
+
+    def _run_parallel(self, features):
+        """Run members concurrently and combine whichever finish within their deadlines"""
+        executor = self._get_executor()
+        try:
+            futures, finished_at, submitted = self._submit_members(executor, features)
+        except BrokenProcessPool:
+            # A worker died since the last request; start over with a fresh pool
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            futures, finished_at, submitted = self._submit_members(executor, features)
+
+        deadlines = {name: self.deadlines.get(name, DEFAULT_DEADLINE) for name in self.weights}
+        # A member queued behind a busy worker starts its clock once it runs,
+        # but waits at most one (longest) deadline for that
+        latest_start = submitted + max(deadlines.values())
+        started_at = {}
+        pending, late = set(futures), set()
+        while pending:
+            now = time.perf_counter()
+            for future in pending:
+                if future not in started_at and (self._has_started(future) or now >= latest_start):
+                    started_at[future] = min(now, latest_start)
+            expired = {future for future in pending if future in started_at and not future.done()
+                       and started_at[future] + deadlines[futures[future]] <= now}
+            late |= expired
+            pending -= expired
+            if not pending:
+                break
+            wake_at = [started_at[future] + deadlines[futures[future]]
+                       for future in pending if future in started_at]
+            if len(wake_at) < len(pending):
+                wake_at.append(min(latest_start, now + START_POLL_SECONDS))
+            _, pending = wait(pending, timeout=max(0.0, min(wake_at) - now), return_when=FIRST_COMPLETED)
+        collected = time.perf_counter()
+
+        raw_predictions, latency_ms, dropped, broken = {}, {}, [], False
+        for future, name in futures.items():
+            if future not in late and future.exception() is None:
+                raw_predictions[name] = future.result()
+                # Done callbacks can lag the wakeup slightly; fall back to now
+                latency_ms[name] = (finished_at.get(name, collected) - started_at.get(future, submitted)) * 1000
+            else:
+                # A member already running can't be interrupted; its result is ignored
+                future.cancel()
+                dropped.append(name)
+                broken = broken or (future.done() and not future.cancelled()
+                                    and isinstance(future.exception(), BrokenProcessPool))
+        if broken:
+            self._discard_executor(executor)
+
+        with self._lock:
+            self._stats['ensemble_runs'] += 1
+            self._stats['dropped_members'] += len(dropped)
+        if not raw_predictions:
+            raise TimeoutError("No ensemble member finished before its deadline")
+        return dict(combine(raw_predictions, self.weights), model_latency_ms=latency_ms,
+                    dropped_models=dropped)
+
+    def _submit_members(self, executor, features):
+        """Submit every member to the pool: ({future: name}, finish times, submit time)"""
+        # Deadlines measure inference, not a cold pool importing NumPy
+        wait(self._warmup, timeout=self.warmup_timeout)
+
+        submitted = time.perf_counter()
+        finished_at = {}
+        futures = {}
+        for name in self.weights:
+            future = self._track(executor.submit(run_model, name, features))
+            future.add_done_callback(lambda f, name=name: finished_at.setdefault(name, time.perf_counter()))
+            futures[future] = name
+        return futures, finished_at, submitted
+
+    def _track(self, future):
+        """Remember a pool task until it finishes, to tell when it gets a worker"""
+        with self._pool_lock:
+            self._in_pool.append(future)
+        future.add_done_callback(self._untrack)
+        return future
+
+    def _untrack(self, future):
+        with self._pool_lock:
+            try:
+                self._in_pool.remove(future)
+            except ValueError:
+                pass
+
+    def _has_started(self, future):
+        """Whether a task has reached a worker (fewer than ``workers`` unfinished tasks ahead of it)"""
+        with self._pool_lock:
+            try:
+                return self._in_pool.index(future) < self.workers
+            except ValueError:
+                return True
+
+    def _discard_executor(self, executor):
+        """Drop a broken pool; the next ensemble request spawns a new one"""
+        with self._lock:
+            # Another request may already have replaced it
+            if self._executor is executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self._warmup = []
+
+    def _get_executor(self):
+        """The process pool, spawned and warmed on first use"""
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers don't inherit the server's threads or locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                # One task per worker so all of them start now
+                self._warmup = [self._track(self._executor.submit(_warm_worker)) for _ in range(self.workers)]
+            return self._executor
@@ -0,0 +1,140 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from config.settings import (
+    PREDICTION_CACHE_TTL, PREDICTION_CACHE_DEFAULT_TTL, PREDICTION_CACHE_MAX_BYTES,
+    PREDICTION_WAIT_TIMEOUT
+)
+from services.single_flight import SingleFlight
+
+# Inputs that only scale the displayed P&L and never change the prediction
+NON_KEY_INPUTS = frozenset({'investment_amount'})
+
+
+def make_prediction_key(user_inputs):
+    """Canonical, hashable form of render_sidebar() output"""
+    return tuple(sorted(
+        (name, str(value).strip())
+        for name, value in user_inputs.items()
+        if name not in NON_KEY_INPUTS
+    ))
+
+
+def _estimate_size(key, result):
+    """Rough in-memory footprint of one cache entry in bytes"""
+    size = sys.getsizeof(key) + sys.getsizeof(result)
+    size += sum(sys.getsizeof(name) + sys.getsizeof(value) for name, value in key)
+    size += sum(sys.getsizeof(name) + sys.getsizeof(value) for name, value in result.items())
+    return size
+
+
+class PredictionCache:
+    """Process-wide cache of prediction results shared by all sessions.
+
+    Entries live for a horizon-dependent TTL (short horizons expire sooner)
+    and the least recently used ones are evicted once the estimated memory
+    use passes ``max_bytes``. Concurrent misses for the same key are
+    coalesced so only one of them computes.
+    """
+
+    def __init__(self, max_bytes=PREDICTION_CACHE_MAX_BYTES, ttl_by_horizon=None,
+                 wait_timeout=PREDICTION_WAIT_TIMEOUT):
+        self.max_bytes = max_bytes
+        self.ttl_by_horizon = ttl_by_horizon or PREDICTION_CACHE_TTL
+        self.wait_timeout = wait_timeout
+        self.single_flight = SingleFlight()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0}
+
+    def get(self, user_inputs):
+        """Cached result for these inputs, or None"""
+        key = make_prediction_key(user_inputs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return dict(entry[0])
+
+    def _peek(self, user_inputs):
+        """Unexpired cached result without touching the stats"""
+        key = make_prediction_key(user_inputs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return dict(entry[0])
+
+    def put(self, user_inputs, result):
+        """Store a result under the horizon's TTL"""
+        key = make_prediction_key(user_inputs)
+        ttl = self.ttl_by_horizon.get(user_inputs.get('prediction_horizon'), PREDICTION_CACHE_DEFAULT_TTL)
+        result = dict(result)
+        size = _estimate_size(key, result)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, time.monotonic() + ttl, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def get_or_compute(self, user_inputs, compute):
+        """Return a cached result or call compute() and cache what it returns.
+
+        Callers that miss while an identical computation is already running
+        wait for it (up to wait_timeout, then TimeoutError) instead of
+        starting their own.
+        """
+        result = self.get(user_inputs)
+        if result is not None:
+            return result
+
+        def compute_and_store():
+            # A previous leader may have filled the entry since our miss
+            cached = self._peek(user_inputs)
+            if cached is not None:
+                return cached
+            computed = compute()
+            self.put(user_inputs, computed)
+            return computed
+
+        result = self.single_flight.do(
+            make_prediction_key(user_inputs), compute_and_store, timeout=self.wait_timeout
+        )
+        return dict(result)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters, hit rate and memory use"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats.update({f'single_flight_{name}': value
+                      for name, value in self.single_flight.stats().items()})
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        """Remove an entry and release its accounted size (lock held)"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
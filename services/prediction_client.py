@@ -0,0 +1,77 @@
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import (
+    PREDICTION_BACKEND, PREDICTION_SERVER_URL, PREDICTION_CLIENT_TIMEOUT, PREDICTION_CLIENT_POOL_SIZE
+)
+from services.ai_predictor import AIPredictor
+
+
+class LocalPredictionClient:
+    """Predictions computed in this process"""
+
+    def __init__(self, model_runner=None):
+        self.model_runner = model_runner
+
+    def predict(self, user_inputs, progress_callback=None):
+        """Prediction dict for one user_inputs dict"""
+        return AIPredictor(user_inputs, self.model_runner).predict(progress_callback)
+
+    def close(self):
+        """Nothing to release"""
+
+
+class HTTPPredictionClient:
+    """Predictions from services.prediction_server over pooled keep-alive connections"""
+
+    def __init__(self, base_url=PREDICTION_SERVER_URL, timeout=PREDICTION_CLIENT_TIMEOUT,
+                 pool_size=PREDICTION_CLIENT_POOL_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        # One session shares its connection pool across threads; connections stay open between requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def predict(self, user_inputs, progress_callback=None):
+        """Prediction dict for one user_inputs dict; TimeoutError if the server is slow or busy"""
+        report = progress_callback or (lambda fraction, message: None)
+        report(0.0, "Requesting prediction...")
+        try:
+            response = self.session.post(f"{self.base_url}/predict", json=user_inputs, timeout=self.timeout)
+        except requests.Timeout as exc:
+            raise TimeoutError(f"Prediction server timed out: {exc}") from exc
+        if response.status_code in (503, 504):
+            raise TimeoutError(_error_message(response, "Prediction server is busy"))
+        if response.status_code != 200:
+            raise RuntimeError(_error_message(response, f"Prediction server returned {response.status_code}"))
+        report(1.0, "Done")
+        return response.json()
+
+    def stats(self):
+        """The server's batching statistics"""
+        response = self.session.get(f"{self.base_url}/stats", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+
+def _error_message(response, default):
+    """The server's JSON error message, or ``default`` for any other error body (e.g. a proxy's HTML page)"""
+    try:
+        return response.json().get('error', default)
+    except (ValueError, AttributeError):
+        return default
+
+
+def create_prediction_client(backend_name=None, model_runner=None):
+    """Build the prediction client selected in config.settings"""
+    backend_name = backend_name or PREDICTION_BACKEND
+    if backend_name == "http":
+        return HTTPPredictionClient()
+    if backend_name == "local":
+        return LocalPredictionClient(model_runner)
+    raise ValueError(f"Unknown prediction backend: {backend_name}")
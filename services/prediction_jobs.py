@@ -0,0 +1,166 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import (
+    PREDICTION_JOB_WORKERS, PREDICTION_JOB_ABANDON_SECONDS, PREDICTION_JOB_RESULT_TTL
+)
+from services.prediction_cache import make_prediction_key
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+
+class _Job:
+    """One background prediction and what its pollers need to know"""
+
+    def __init__(self, key, user_inputs, holder):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.user_inputs = dict(user_inputs)
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = "Queued..."
+        self.result = None
+        self.error = None
+        self.future = None
+        # Sessions interested in the job; a session resubmitting joins only once
+        self.holders = {holder}
+        self.submitted_at = time.monotonic()
+        self.last_polled = self.submitted_at
+        self.finished_at = None
+
+    def report(self, fraction, message):
+        """Progress callback for the prediction pipeline"""
+        self.progress = fraction
+        self.message = message
+
+
+class PredictionJobs:
+    """Run predictions on a worker pool so the Streamlit script never waits on them.
+
+    ``submit`` returns a job id at once and the UI polls ``status`` until
+    the result lands. Submitting inputs that already have a queued or
+    running job joins it instead of starting another; each ``holder`` (a
+    session id) counts once. Queued jobs that every holder has released,
+    or that nobody has polled for
+    ``abandon_after`` seconds, are cancelled; a job already running can't
+    be interrupted, so it finishes into the prediction cache instead.
+    """
+
+    def __init__(self, prediction_cache, prediction_client, workers=PREDICTION_JOB_WORKERS,
+                 abandon_after=PREDICTION_JOB_ABANDON_SECONDS, result_ttl=PREDICTION_JOB_RESULT_TTL):
+        self.prediction_cache = prediction_cache
+        self.prediction_client = prediction_client
+        self.abandon_after = abandon_after
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prediction-job")
+        self._jobs = {}
+        self._active_by_key = {}
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'deduplicated': 0, 'completed': 0, 'failed': 0, 'cancelled': 0}
+
+    def submit(self, user_inputs, holder):
+        """Queue a prediction for ``holder`` (or join an identical active one) and return its job id"""
+        key = make_prediction_key(user_inputs)
+        with self._lock:
+            self._reap()
+            job = self._jobs.get(self._active_by_key.get(key))
+            if job is not None:
+                job.holders.add(holder)
+                job.last_polled = time.monotonic()
+                self._stats['deduplicated'] += 1
+                return job.id
+
+            job = _Job(key, user_inputs, holder)
+            self._jobs[job.id] = job
+            self._active_by_key[key] = job.id
+            self._stats['submitted'] += 1
+            job.future = self._executor.submit(self._run, job)
+            return job.id
+
+    def status(self, job_id):
+        """Poll a job: {id, state, progress, message, result, error, elapsed}, or None if unknown"""
+        with self._lock:
+            self._reap()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.last_polled = time.monotonic()
+            return {
+                'id': job.id,
+                'state': job.state,
+                'progress': job.progress,
+                'message': job.message,
+                'result': dict(job.result) if job.result is not None else None,
+                'error': job.error,
+                'elapsed': (job.finished_at or job.last_polled) - job.submitted_at
+            }
+
+    def release(self, job_id, holder):
+        """Drop one holder's interest; a queued job nobody holds is cancelled"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.holders.discard(holder)
+            if not job.holders:
+                self._cancel(job)
+
+    def stats(self):
+        """Job counters plus how many are queued or running"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active'] = len(self._active_by_key)
+        return stats
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        """Worker: compute through the shared prediction cache, reporting progress"""
+        with self._lock:
+            if job.state != QUEUED:
+                return
+            job.state = RUNNING
+        try:
+            result = self.prediction_cache.get_or_compute(
+                job.user_inputs, lambda: self.prediction_client.predict(job.user_inputs, job.report)
+            )
+        except TimeoutError:
+            self._finish(job, FAILED, error="⏳ The prediction service is busy. Please try again in a moment.")
+        except Exception as exc:
+            self._finish(job, FAILED, error=f"Prediction failed: {exc}")
+        else:
+            self._finish(job, DONE, result=result)
+
+    def _finish(self, job, state, result=None, error=None):
+        """Record a job's outcome and stop deduplicating onto it"""
+        with self._lock:
+            job.state = state
+            job.result = result
+            job.error = error
+            job.progress = 1.0 if state == DONE else job.progress
+            job.finished_at = time.monotonic()
+            self._stats['completed' if state == DONE else 'failed'] += 1
+            if self._active_by_key.get(job.key) == job.id:
+                del self._active_by_key[job.key]
+
+    def _cancel(self, job):
+        """Cancel a job that hasn't started (lock held)"""
+        if job.state == QUEUED and job.future.cancel():
+            job.state = CANCELLED
+            job.message = "Cancelled"
+            job.finished_at = time.monotonic()
+            self._stats['cancelled'] += 1
+            if self._active_by_key.get(job.key) == job.id:
+                del self._active_by_key[job.key]
+
+    def _reap(self):
+        """Cancel abandoned queued jobs and forget finished ones past their TTL (lock held)"""
+        now = time.monotonic()
+        for job in list(self._jobs.values()):
+            if job.state == QUEUED and now - job.last_polled > self.abandon_after:
+                self._cancel(job)
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl:
+                del self._jobs[job.id]
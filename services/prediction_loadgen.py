@@ -0,0 +1,107 @@
+"""Load generator for services.prediction_server.
+
+Fires prediction requests for random assets and horizons from concurrent
+client threads sharing one pooled HTTPPredictionClient, then reports
+throughput, latency percentiles and the server's batching statistics
+(batch counts for this run; the max batch size is the server's lifetime max).
+
+Usage: python -m services.prediction_loadgen [--requests 5000] [--concurrency 32] [--model-type XGBoost]
+Start the server first: python -m services.prediction_server
+"""
+import argparse
+import threading
+import time
+import numpy as np
+from config.settings import AI_MODELS, PREDICTION_SERVER_URL
+from services.ai_predictor import build_universe_requests
+from services.prediction_client import HTTPPredictionClient
+
+PERCENTILES = (50, 90, 99)
+
+
+def run_load(client, requests, concurrency):
+    """Send ``requests`` over ``concurrency`` threads; returns (latencies s, errors, elapsed s)"""
+    latencies = np.full(len(requests), np.nan)
+    errors = []
+    next_index = iter(range(len(requests)))
+    index_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with index_lock:
+                i = next(next_index, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            try:
+                client.predict(requests[i])
+            except Exception as exc:
+                errors.append(str(exc))
+                continue
+            latencies[i] = time.perf_counter() - started
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies[~np.isnan(latencies)], errors, time.perf_counter() - started
+
+
+def format_report(latencies, errors, elapsed, server_stats=None):
+    """Plain-text summary of a load run"""
+    lines = [
+        f"Requests: {len(latencies) + len(errors)} ({len(errors)} errors) in {elapsed:.2f} s",
+        f"Throughput: {len(latencies) / elapsed:,.0f} predictions/s" if elapsed else "Throughput: n/a"
+    ]
+    if len(latencies):
+        percentiles = np.percentile(latencies * 1000, PERCENTILES)
+        lines.append("Latency ms: " + ", ".join(
+            f"p{p} {value:.1f}" for p, value in zip(PERCENTILES, percentiles)
+        ) + f", max {latencies.max() * 1000:.1f}")
+    if server_stats:
+        lines.append(
+            f"Server: {server_stats['batches']} batches, mean size {server_stats['mean_batch_size']:.1f}, "
+            f"lifetime max {server_stats['max_batch_size']}"
+        )
+    if errors:
+        lines.append(f"First error: {errors[0]}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the prediction server")
+    parser.add_argument("--url", default=PREDICTION_SERVER_URL, help="Prediction server base URL")
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client threads")
+    parser.add_argument("--model-type", choices=AI_MODELS, default=AI_MODELS[0], help="Model to request")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the request mix")
+    args = parser.parse_args()
+
+    universe = build_universe_requests()
+    rng = np.random.default_rng(args.seed)
+    requests = [dict(universe[i], model_type=args.model_type)
+                for i in rng.integers(0, len(universe), args.requests)]
+
+    client = HTTPPredictionClient(args.url, pool_size=args.concurrency)
+    try:
+        before = client.stats()
+        latencies, errors, elapsed = run_load(client, requests, args.concurrency)
+        after = client.stats()
+    finally:
+        client.close()
+
+    # This run's share of the server's counters; the max batch size can't be
+    # split per run, so it is the server's all-time max
+    batches = after['batches'] - before['batches']
+    server_stats = {
+        'batches': batches,
+        'mean_batch_size': (after['requests'] - before['requests']) / batches if batches else 0.0,
+        'max_batch_size': after['max_batch_size']
+    }
+    print(format_report(latencies, errors, elapsed, server_stats))
+
+
+if __name__ == "__main__":
+    main()
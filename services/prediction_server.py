@@ -0,0 +1,246 @@
+"""Local HTTP prediction service with dynamic micro-batching.
+
+Requests are queued, collected for up to ``--batch-wait-ms`` after the
+first one arrives (or until ``--max-batch`` have), scored with one
+AIPredictor.predict_batch call per model type and answered row by row, so
+concurrent callers share vectorized passes instead of running one each.
+
+Endpoints: POST /predict (user_inputs JSON -> prediction JSON), GET /stats,
+GET /health.
+
+Usage: python -m services.prediction_server [--port 8600] [--batch-wait-ms 5] [--max-batch 256]
+Then set PREDICTION_BACKEND = "http" in config/settings.py.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import (
+    AI_MODELS, MARKET_OPTIONS, PREDICTION_HORIZONS, PREDICTION_SERVER_HOST, PREDICTION_SERVER_PORT,
+    PREDICTION_SERVER_BATCH_WAIT_MS, PREDICTION_SERVER_MAX_BATCH, PREDICTION_SERVER_REQUEST_TIMEOUT
+)
+from services.ai_predictor import AIPredictor, prediction_row
+from services.model_runner import ModelRunner, DEFAULT_MODEL, ENSEMBLE_MODEL
+
+KNOWN_ASSETS = frozenset(asset for assets in MARKET_OPTIONS.values() for asset in assets)
+KNOWN_MODELS = frozenset(AI_MODELS) | {ENSEMBLE_MODEL}
+
+
+def validate_request(user_inputs):
+    """Error message for a request that would fail its whole batch, or None"""
+    if not isinstance(user_inputs, dict):
+        return "Expected a JSON object of user inputs"
+    if user_inputs.get('selected_asset') not in KNOWN_ASSETS:
+        return f"Unknown asset: {user_inputs.get('selected_asset')!r}"
+    if user_inputs.get('prediction_horizon') not in PREDICTION_HORIZONS:
+        return f"Unknown horizon: {user_inputs.get('prediction_horizon')!r}"
+    if user_inputs.get('model_type', DEFAULT_MODEL) not in KNOWN_MODELS:
+        return f"Unknown model type: {user_inputs.get('model_type')!r}"
+    return None
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches scored on one thread"""
+
+    def __init__(self, model_runner=None, batch_wait=PREDICTION_SERVER_BATCH_WAIT_MS / 1000,
+                 max_batch=PREDICTION_SERVER_MAX_BATCH):
+        self.model_runner = model_runner
+        self.batch_wait = batch_wait
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'batches': 0, 'max_batch_size': 0, 'errors': 0, 'busy_seconds': 0.0}
+
+    def start(self):
+        """Start the batching thread"""
+        self._thread = threading.Thread(target=self._loop, name="prediction-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Finish the queued requests and stop the batching thread"""
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, user_inputs):
+        """Queue one request; the returned Future resolves to its prediction dict"""
+        future = Future()
+        self._queue.put((user_inputs, future))
+        return future
+
+    def stats(self):
+        """Requests, batches, batch sizes and time spent scoring"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['mean_batch_size'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+    def _loop(self):
+        """Wait for a request, gather whatever else arrives within batch_wait, score them"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stopping:
+                return
+
+    def _run_batch(self, batch):
+        """Score a batch (one predict_batch call per model type) and resolve each request"""
+        started = time.perf_counter()
+        by_model = {}
+        for user_inputs, future in batch:
+            if future.set_running_or_notify_cancel():
+                by_model.setdefault(user_inputs.get('model_type', DEFAULT_MODEL), []).append(
+                    (user_inputs, future)
+                )
+
+        errors = 0
+        for model_type, items in by_model.items():
+            try:
+                results = AIPredictor.predict_batch(
+                    [user_inputs for user_inputs, _ in items], model_type=model_type,
+                    model_runner=self.model_runner
+                )
+            except Exception as exc:
+                errors += len(items)
+                for _, future in items:
+                    future.set_exception(exc)
+                continue
+            for index, (_, future) in enumerate(items):
+                # One bad row fails its own request, not the batcher thread
+                try:
+                    prediction = prediction_row(results, index)
+                except Exception as exc:
+                    errors += 1
+                    future.set_exception(exc)
+                else:
+                    future.set_result(prediction)
+
+        with self._lock:
+            self._stats['requests'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['max_batch_size'] = max(self._stats['max_batch_size'], len(batch))
+            self._stats['errors'] += errors
+            self._stats['busy_seconds'] += time.perf_counter() - started
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints in front of the server's MicroBatcher"""
+
+    # HTTP/1.1 keeps client connections open between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.batcher.stats())
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            user_inputs = json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            self._send_json(400, {'error': "Request body must be JSON"})
+            return
+        problem = validate_request(user_inputs)
+        if problem is not None:
+            self._send_json(400, {'error': problem})
+            return
+
+        future = self.server.batcher.submit(user_inputs)
+        try:
+            prediction = future.result(timeout=self.server.request_timeout)
+        except TimeoutError as exc:
+            if future.done() and future.exception() is exc:
+                # The prediction itself timed out (no ensemble member made its deadline)
+                self._send_json(503, {'error': str(exc)})
+            else:
+                future.cancel()
+                self._send_json(504, {'error': "Timed out waiting for the prediction batch"})
+        except Exception as exc:
+            self._send_json(500, {'error': f"Prediction failed: {exc}"})
+        else:
+            self._send_json(200, prediction)
+
+    def log_message(self, format, *args):
+        """Keep the console quiet under load"""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    """Threaded HTTP server whose handlers share one MicroBatcher"""
+
+    daemon_threads = True
+    # Room for a burst of new connections from a load test
+    request_queue_size = 128
+
+    def __init__(self, address, batcher, request_timeout=PREDICTION_SERVER_REQUEST_TIMEOUT):
+        super().__init__(address, PredictionRequestHandler)
+        self.batcher = batcher
+        self.request_timeout = request_timeout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve predictions over HTTP with micro-batching")
+    parser.add_argument("--host", default=PREDICTION_SERVER_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=PREDICTION_SERVER_PORT, help="Port to listen on")
+    parser.add_argument("--batch-wait-ms", type=float, default=PREDICTION_SERVER_BATCH_WAIT_MS,
+                        help="How long to collect requests after the first one in a batch")
+    parser.add_argument("--max-batch", type=int, default=PREDICTION_SERVER_MAX_BATCH,
+                        help="Score a batch as soon as it has this many requests")
+    args = parser.parse_args()
+
+    model_runner = ModelRunner()
+    batcher = MicroBatcher(model_runner, args.batch_wait_ms / 1000, args.max_batch).start()
+    server = PredictionServer((args.host, args.port), batcher)
+    print(f"Serving predictions on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+        model_runner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
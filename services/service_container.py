@@ -0,0 +1,193 @@
+import atexit
+import threading
+from config.settings import MARKET_FEED_ENABLED, MODEL_PREWARM, PREDICTION_BACKEND
+from services.prediction_cache import PredictionCache
+from utils.activity_writer import ActivityWriter
+from utils.user_cache import UserRecordCache
+from utils.user_database import UserDatabase
+
+
+class ServiceContainer:
+    """Thread-safe registry of long-lived services shared by all sessions.
+
+    Services are registered as factories and built once on first ``get``.
+    Each service may declare a shutdown hook; ``shutdown`` runs them in
+    reverse build order so dependents stop before what they depend on.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._shutdown_hooks = {}
+        self._instances = {}
+        self._build_order = []
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def register(self, name, factory, shutdown=None):
+        """Register a factory taking the container and an optional shutdown hook"""
+        with self._lock:
+            self._factories[name] = factory
+            if shutdown is not None:
+                self._shutdown_hooks[name] = shutdown
+
+    def get(self, name):
+        """Return the named service, building it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            if self._closed:
+                raise RuntimeError("Service container has been shut down")
+            if name not in self._factories:
+                raise KeyError(f"Unknown service: {name}")
+            instance = self._factories[name](self)
+            self._instances[name] = instance
+            self._build_order.append(name)
+            return instance
+
+    def start(self, names=None):
+        """Eagerly build services (all registered ones by default)"""
+        for name in names or list(self._factories):
+            self.get(name)
+
+    def shutdown(self):
+        """Run shutdown hooks in reverse build order"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for name in reversed(self._build_order):
+                hook = self._shutdown_hooks.get(name)
+                if hook is not None:
+                    hook(self._instances[name])
+            self._instances.clear()
+            self._build_order.clear()
+
+
+def _build_user_cache(container):
+    return UserRecordCache()
+
+
+def _build_user_db(container):
+    return UserDatabase(user_cache=container.get("user_cache"))
+
+
+def _build_activity_writer(container):
+    return ActivityWriter(container.get("user_db"))
+
+
+def _build_prediction_cache(container):
+    return PredictionCache()
+
+
+# The market data services pull in NumPy, so they are imported when first
+# built rather than at startup; the login page never needs them
+
+
+def _build_history_store(container):
+    from utils.history_store import HistoryStore
+    return HistoryStore.open()
+
+
+def _build_rollup_engine(container):
+    from utils.rollup_engine import RollupEngine
+    return RollupEngine.open(container.get("history_store"))
+
+
+def _build_tick_store(container):
+    from utils.tick_store import TickStore
+    return TickStore.open()
+
+
+def _build_market_feed(container):
+    from services.market_feed import MarketFeedIngestor
+    feed = MarketFeedIngestor(container.get("tick_store"), container.get("rollup_engine"))
+    if MARKET_FEED_ENABLED:
+        feed.start()
+    return feed
+
+
+def _build_model_registry(container):
+    from services.model_registry import ModelRegistry, prewarm_keys
+    from services.model_runner import MODELS
+    registry = ModelRegistry.open()
+    if MODEL_PREWARM:
+        registry.prewarm(prewarm_keys(MODELS))
+    return registry
+
+
+def _build_model_runner(container):
+    from services.model_runner import ModelRunner
+    runner = ModelRunner()
+    if MODEL_PREWARM:
+        # Spawn the ensemble workers now; each loads every model as it starts
+        runner.start()
+    return runner
+
+
+def _build_prediction_client(container):
+    from services.prediction_client import create_prediction_client
+    # Only in-process predictions need the local model runner
+    model_runner = container.get("model_runner") if PREDICTION_BACKEND == "local" else None
+    return create_prediction_client(model_runner=model_runner)
+
+
+def _build_prediction_jobs(container):
+    from services.prediction_jobs import PredictionJobs
+    return PredictionJobs(container.get("prediction_cache"), container.get("prediction_client"))
+
+
+def _build_backtester(container):
+    from services.backtester import Backtester
+    return Backtester(container.get("history_store"))
+
+
+def create_default_container():
+    """Container with the application's standard services registered"""
+    container = ServiceContainer()
+    container.register("user_cache", _build_user_cache)
+    container.register("user_db", _build_user_db)
+    container.register("activity_writer", _build_activity_writer,
+                       shutdown=lambda writer: writer.shutdown())
+    container.register("prediction_cache", _build_prediction_cache)
+    container.register("history_store", _build_history_store)
+    container.register("rollup_engine", _build_rollup_engine)
+    container.register("tick_store", _build_tick_store)
+    container.register("market_feed", _build_market_feed, shutdown=lambda feed: feed.stop())
+    container.register("model_registry", _build_model_registry)
+    container.register("model_runner", _build_model_runner,
+                       shutdown=lambda runner: runner.shutdown())
+    container.register("prediction_client", _build_prediction_client,
+                       shutdown=lambda client: client.close())
+    container.register("prediction_jobs", _build_prediction_jobs,
+                       shutdown=lambda jobs: jobs.shutdown())
+    container.register("backtester", _build_backtester,
+                       shutdown=lambda backtester: backtester.shutdown())
+    return container
+
+
+# Built eagerly by get_services(); everything else is built on first use
+STARTUP_SERVICES = ["user_cache", "user_db", "activity_writer", "prediction_cache"]
+if MARKET_FEED_ENABLED:
+    STARTUP_SERVICES.append("market_feed")
+if MODEL_PREWARM:
+    STARTUP_SERVICES.extend(["model_registry", "model_runner"])
+
+_container = None
+_container_lock = threading.Lock()
+
+
+def get_services():
+    """Return the process-wide service container, building it once"""
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                container = create_default_container()
+                container.start(STARTUP_SERVICES)
+                atexit.register(container.shutdown)
+                _container = container
+    return _container
@@ -0,0 +1,71 @@
+import threading
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function in its own thread; callers
+    arriving while it runs block until it finishes and receive the same
+    result (or exception). Followers give up with TimeoutError after
+    ``timeout`` seconds; the leader keeps running and later callers can
+    still join it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'executions': 0, 'shared': 0, 'timeouts': 0}
+
+    def do(self, key, fn, timeout=None):
+        """Run fn() once per key at a time and share its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+                self._stats['executions'] += 1
+            else:
+                call.waiters += 1
+                leader = False
+                self._stats['shared'] += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                raise TimeoutError(f"Timed out waiting for in-flight computation of {key!r}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Executions, calls served from a shared execution and follower timeouts"""
+        with self._lock:
+            return dict(self._stats)
@@ -1,10 +1,49 @@
 import streamlit as st
+import hashlib
 import os
+import re
+import threading
+from functools import lru_cache
+from config.theme_settings import THEMES, get_theme_config
+
+# Theme settings -> the CSS variables they drive in the stylesheets
+THEME_VARIABLES = {
+    "primary_color": "--primary-color",
+    "background_color": "--background-primary",
+    "secondary_background_color": "--background-secondary",
+    "text_color": "--text-primary"
+}
+
+_COMMENTS = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION_SPACES = re.compile(r'\s*([{};,>])\s*')
+_COLON_SPACES = re.compile(r'(?<=[;{])\s*([-\w]+)\s*:\s*')
+_IMPORT = re.compile(r'@import\s*(?:url\([^)]*\)|"[^"]*"|\'[^\']*\')[^;]*;')
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _COMMENTS.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    css = _PUNCTUATION_SPACES.sub(r'\1', css)
+    css = _COLON_SPACES.sub(r'\1:', css)
+    return css.replace(';}', '}').strip()
 
 class StyleManager:
-    def __init__(self):
-        self.styles_dir = "styles"
-        
+    """Loads the stylesheets into one minified bundle, built once per process.
+
+    The bundle is content-hashed and cached in memory, so reruns never touch
+    the disk. Themes only swap a small block of CSS variables; the bundle
+    element itself stays byte-identical between runs and sessions.
+    """
+
+    BUNDLE_FILES = ("professional_theme.css", "components.css")
+
+    _bundle = None
+    _bundle_lock = threading.Lock()
+
+    def __init__(self, styles_dir="styles"):
+        self.styles_dir = styles_dir
+
     def load_css_file(self, filename):
         """Load CSS from external file"""
         css_path = os.path.join(self.styles_dir, filename)
@@ -15,22 +54,39 @@ class StyleManager:
         except FileNotFoundError:
             # Fallback to inline CSS if file doesn't exist
             return self.get_fallback_css()
-    
-    def load_professional_theme(self):
-        """Load professional theme styling"""
-        css_content = self.load_css_file("professional_theme.css")
-        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-    
-    def load_dark_theme(self):
-        """Load dark theme styling"""
-        css_content = self.load_css_file("dark_theme.css")
-        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-    
-    def load_custom_components(self):
-        """Load custom component styles"""
-        css_content = self.load_css_file("components.css")
-        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-    
+
+    def build_bundle(self):
+        """Concatenate and minify the stylesheets; returns {'css', 'hash'}"""
+        sources = [minify_css(self.load_css_file(filename)) for filename in self.BUNDLE_FILES]
+
+        # @import rules are only valid at the very top of a stylesheet
+        imports, rules = [], []
+        for css in sources:
+            match = _IMPORT.match(css)
+            while match:
+                imports.append(match.group())
+                css = css[match.end():]
+                match = _IMPORT.match(css)
+            rules.append(css)
+        css = ''.join(imports + rules)
+        return {'css': css, 'hash': hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}
+
+    @classmethod
+    def get_bundle(cls):
+        """The process-wide CSS bundle, built on first use"""
+        if cls._bundle is None:
+            with cls._bundle_lock:
+                if cls._bundle is None:
+                    cls._bundle = cls().build_bundle()
+        return cls._bundle
+
+    def inject(self, theme_name="professional"):
+        """Emit the cached bundle and, separately, the selected theme's variables"""
+        bundle = self.get_bundle()
+        st.markdown(f'<style id="app-css-{bundle["hash"]}">{bundle["css"]}</style>',
+                    unsafe_allow_html=True)
+        st.markdown(theme_style(theme_name), unsafe_allow_html=True)
+
     def get_fallback_css(self):
         """Fallback CSS if external files aren't found"""
         return """
@@ -55,8 +111,17 @@ class StyleManager:
         }
         """
 
+@lru_cache(maxsize=len(THEMES) + 1)
+def theme_style(theme_name):
+    """A tiny <style> block overriding the CSS variables for a theme"""
+    theme = get_theme_config(theme_name)
+    variables = ';'.join(f"{THEME_VARIABLES[name]}:{value}" for name, value in theme.items()
+                         if name in THEME_VARIABLES)
+    return f'<style id="app-theme">:root{{{variables}}}</style>'
+
 def load_custom_css():
-    """Main function to load all CSS styling"""
-    style_manager = StyleManager()
-    style_manager.load_professional_theme()
-    style_manager.load_custom_components()
\ No newline at end of file
+    """Inject the app's CSS bundle with the session's theme"""
+    # Streamlit drops elements a full rerun doesn't redraw, so the unchanged
+    # bundle is re-emitted from memory; switching themes only changes the
+    # small variables block that follows it
+    StyleManager().inject(st.session_state.get('theme', "professional"))
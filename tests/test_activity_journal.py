@@ -0,0 +1,75 @@
+"""Activity journal compaction, including a crash partway through."""
+import os
+import pytest
+from utils.activity_journal import ActivityJournal, COMPACTION_MARKER
+
+RETENTION = 5
+
+
+def fill(journal, count=60):
+    """Append numbered records for two users across several segments"""
+    for i in range(count):
+        journal.append('alice' if i % 2 else 'bob', {'activity_type': 'login', 'details': {'i': i}})
+
+
+def numbers(journal, username):
+    return [entry['details']['i'] for entry in journal.tail(username, RETENTION)]
+
+
+def make_journal(directory):
+    return ActivityJournal(str(directory), retention=RETENTION, segment_max_bytes=300,
+                           compaction_threshold=10 ** 6)
+
+
+def test_compaction_keeps_the_retained_records(tmp_path):
+    journal = make_journal(tmp_path)
+    fill(journal)
+    before = {user: numbers(journal, user) for user in ('alice', 'bob')}
+    segments = len(journal._segment_ids())
+
+    journal.compact()
+    assert len(journal._segment_ids()) < segments
+    journal.close()
+
+    reopened = make_journal(tmp_path)
+    assert {user: numbers(reopened, user) for user in ('alice', 'bob')} == before
+
+
+def test_crash_between_replace_and_delete_replays_no_duplicates(tmp_path, monkeypatch):
+    journal = make_journal(tmp_path)
+    fill(journal)
+    expected = {user: numbers(journal, user) for user in ('alice', 'bob')}
+
+    real_remove = os.remove
+
+    def crash(path):
+        raise OSError("simulated crash")
+
+    # The compacted segment is swapped in, then the process dies before cleanup
+    monkeypatch.setattr(os, 'remove', crash)
+    with pytest.raises(OSError):
+        journal.compact()
+    monkeypatch.setattr(os, 'remove', real_remove)
+    journal.close()
+    assert os.path.exists(tmp_path / COMPACTION_MARKER)
+
+    # A wide retention replays everything on disk, so duplicates would show
+    reopened = ActivityJournal(str(tmp_path), retention=1000)
+    assert not os.path.exists(tmp_path / COMPACTION_MARKER)
+    assert {user: [entry['details']['i'] for entry in reopened.tail(user, 1000)]
+            for user in ('alice', 'bob')} == expected
+
+
+def test_unfinished_copy_is_discarded_on_restart(tmp_path):
+    journal = make_journal(tmp_path)
+    fill(journal)
+    expected = {user: numbers(journal, user) for user in ('alice', 'bob')}
+    journal.close()
+    # A copy torn by a crash before the marker was written
+    first = journal._segment_path(journal._segment_ids()[0])
+    with open(first + ".compact", "wb") as f:
+        f.write(b'{"username":"alice","activity_type":"torn"')
+
+    reopened = make_journal(tmp_path)
+    assert not os.path.exists(first + ".compact")
+    assert {user: numbers(reopened, user) for user in ('alice', 'bob')} == expected
@@ -0,0 +1,59 @@
+"""HistoryStore appends keep the column files aligned."""
+import numpy as np
+import pytest
+from utils.history_store import COLUMNS, HistoryStore
+
+BAR_SECONDS = 3600
+
+
+def bars_after(last_timestamp, count):
+    """Bars whose every field encodes its timestamp, so misalignment is visible"""
+    timestamps = last_timestamp + BAR_SECONDS * np.arange(1, count + 1, dtype=np.int64)
+    return {name: timestamps.astype(dtype) for name, dtype in COLUMNS.items()}
+
+
+def assert_aligned(store, asset, start):
+    """Every column of the bars from ``start`` on still matches its timestamp"""
+    tail = store.range(asset, start=start)
+    assert len(tail['timestamp'])
+    for name in COLUMNS:
+        assert np.array_equal(np.asarray(tail[name], dtype=np.float64),
+                              np.asarray(tail['timestamp'], dtype=np.float64)), name
+
+
+def test_append_after_a_failed_append_stays_aligned(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path), bar_seconds=BAR_SECONDS, seed_bars=10)
+    asset = 'BTC/USD'
+    last = int(store.tail(asset, 1)['timestamp'][-1])
+    first_appended = last + BAR_SECONDS
+    store.append(asset, bars_after(last, 5))
+    last += 5 * BAR_SECONDS
+
+    # Fail the append after the first two column files have been written
+    written = []
+    real_ascontiguousarray = np.ascontiguousarray
+
+    def failing(values, dtype=None):
+        if len(written) == 2:
+            raise OSError("disk full")
+        written.append(dtype)
+        return real_ascontiguousarray(values, dtype=dtype)
+
+    monkeypatch.setattr(np, 'ascontiguousarray', failing)
+    with pytest.raises(OSError):
+        store.append(asset, bars_after(last, 3))
+    monkeypatch.undo()
+
+    store.append(asset, bars_after(last, 4))
+    assert store.version(asset) == 10 + 5 + 4
+    assert_aligned(store, asset, first_appended)
+
+
+def test_append_rejects_ragged_columns(tmp_path):
+    store = HistoryStore(str(tmp_path), bar_seconds=BAR_SECONDS, seed_bars=10)
+    last = int(store.tail('ETH/USD', 1)['timestamp'][-1])
+    bars = bars_after(last, 3)
+    bars['close'] = bars['close'][:2]
+    with pytest.raises(ValueError):
+        store.append('ETH/USD', bars)
+    assert store.version('ETH/USD') == 10
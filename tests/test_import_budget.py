@@ -0,0 +1,24 @@
+"""Cold-start import cost of the entry point, checked in a fresh interpreter."""
+from config.settings import STARTUP_IMPORT_BUDGET_MS
+from utils.import_profiler import TARGETS, LOGIN_FORBIDDEN, best_of, check, total_ms
+
+# Keep the fastest of a few runs so scheduler noise doesn't fail the budget
+RUNS = 3
+
+
+def test_import_main_within_budget_and_lazy():
+    records = best_of(TARGETS['import'], RUNS)
+    assert records, "python -X importtime produced no import records"
+    assert check(records, STARTUP_IMPORT_BUDGET_MS, LOGIN_FORBIDDEN) == [], total_ms(records)
+
+
+def test_login_page_within_budget_and_lazy():
+    records = best_of(TARGETS['login'], RUNS)
+    assert check(records, STARTUP_IMPORT_BUDGET_MS, LOGIN_FORBIDDEN) == [], total_ms(records)
+
+
+def test_check_reports_forbidden_modules_and_budget():
+    records = best_of(TARGETS['app'], 1)
+    problems = check(records, 0, LOGIN_FORBIDDEN)
+    assert any("exceeds" in problem for problem in problems)
+    assert any(problem.startswith("numpy ") for problem in problems)
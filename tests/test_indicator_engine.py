@@ -0,0 +1,79 @@
+"""Indicator engine results against the pandas reference implementations."""
+import numpy as np
+import pandas as pd
+from utils.helpers import calculate_technical_indicators
+from utils.indicator_engine import sma, rolling_std, ema, rsi, macd
+
+ASSETS = 4
+BARS = 300
+
+
+def random_walk(seed=7):
+    """Positive random-walk closes shaped (assets, bars)"""
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (ASSETS, BARS)), axis=1))
+
+
+def wilder_rsi_reference(close, window=14):
+    """Wilder RSI in pandas: an SMA seed, then ewm(alpha=1/window, adjust=False)"""
+    delta = pd.Series(close).diff()
+    averages = []
+    for side in (delta.clip(lower=0), (-delta).clip(lower=0)):
+        seeded = side.copy()
+        seeded.iloc[:window] = np.nan
+        seeded.iloc[window] = side.iloc[1:window + 1].mean()
+        averages.append(seeded.iloc[window:].ewm(alpha=1 / window, adjust=False).mean()
+                        .reindex(side.index))
+    return 100 - 100 / (1 + averages[0] / averages[1])
+
+
+def test_sma_matches_pandas_rolling_mean():
+    close = random_walk()
+    for window in (5, 20, 50):
+        expected = np.vstack([pd.Series(row).rolling(window).mean() for row in close])
+        assert np.allclose(sma(close, window), expected, equal_nan=True)
+
+
+def test_sma_matches_calculate_technical_indicators():
+    close = random_walk()
+    for i, row in enumerate(close):
+        reference = calculate_technical_indicators({'price': row})
+        assert np.allclose(sma(close, 20)[i], reference['sma_20'], equal_nan=True)
+        assert np.allclose(sma(close, 50)[i], reference['sma_50'], equal_nan=True)
+
+
+def test_rolling_std_matches_pandas():
+    close = random_walk()
+    expected = np.vstack([pd.Series(row).rolling(20).std() for row in close])
+    assert np.allclose(rolling_std(close, 20), expected, equal_nan=True)
+
+
+def test_ema_and_macd_match_pandas_ewm():
+    close = random_walk()
+    for span in (9, 12, 26):
+        expected = np.vstack([pd.Series(row).ewm(span=span, adjust=False).mean() for row in close])
+        assert np.allclose(ema(close, span), expected)
+
+    macd_line, signal_line, histogram = macd(close)
+    for i, row in enumerate(close):
+        series = pd.Series(row)
+        line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+        assert np.allclose(macd_line[i], line)
+        assert np.allclose(signal_line[i], signal)
+        assert np.allclose(histogram[i], line - signal)
+
+
+def test_rsi_matches_pandas_wilder_reference():
+    close = random_walk()
+    expected = np.vstack([wilder_rsi_reference(row) for row in close])
+    actual = rsi(close)
+    assert np.isnan(actual[:, :14]).all()
+    assert np.allclose(actual, expected, equal_nan=True)
+
+
+def test_short_series_is_all_nan():
+    close = random_walk()[:, :10]
+    assert np.isnan(sma(close, 20)).all()
+    assert np.isnan(rolling_std(close, 20)).all()
+    assert np.isnan(rsi(close)).all()
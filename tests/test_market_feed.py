@@ -0,0 +1,47 @@
+"""Tick parsing and batch dispatch in the market feed ingestor."""
+import asyncio
+import numpy as np
+import pytest
+from services.market_feed import MarketFeedIngestor, parse_ticks
+
+
+def test_parse_ticks_rejects_rows_whose_fields_only_add_up():
+    batches, errors = parse_ticks(['BTC/USD,1,2,3,4,5', 'BTC/USD,6,7,8', 'BTC/USD,9,10,11,12'])
+    assert errors == 2
+    assert batches['BTC/USD'].tolist() == [[9, 10, 11, 12]]
+
+
+def test_parse_ticks_fast_path():
+    batches, errors = parse_ticks(['ETH/USD,1,2,3,4', 'BTC/USD,5,6,7,8', 'ETH/USD,9,10,11,12'])
+    assert errors == 0
+    assert batches['ETH/USD'].tolist() == [[1, 2, 3, 4], [9, 10, 11, 12]]
+
+
+class FailingTickStore:
+    """Accepts BTC/USD ticks and fails on ETH/USD, i.e. partway through a batch"""
+
+    def __init__(self):
+        self.appended = []
+
+    def assets(self):
+        return ['BTC/USD', 'ETH/USD']
+
+    def append_many(self, asset, timestamps, bids, asks, volumes):
+        if asset == 'ETH/USD':
+            raise RuntimeError("store unavailable")
+        self.appended.extend(np.asarray(timestamps).tolist())
+
+
+def test_failed_dispatch_is_not_reapplied():
+    store = FailingTickStore()
+    ingestor = MarketFeedIngestor(store, batch_ticks=2, batch_interval=60)
+
+    async def consume():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'BTC/USD,1,100,101,1\nETH/USD,2,10,11,1\n')
+        reader.feed_eof()
+        await ingestor._consume(reader)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(consume())
+    assert store.appended == [1.0]
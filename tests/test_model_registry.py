@@ -0,0 +1,49 @@
+"""Model artifacts are published atomically behind the CURRENT pointer."""
+import os
+import threading
+import numpy as np
+from services.model_registry import ModelRegistry, artifact_path, current_version, save_artifact, VERSION_PREFIX
+
+MODEL = "XGBoost"
+
+
+def test_republish_switches_versions_and_keeps_the_previous_one(tmp_path):
+    directory = str(tmp_path)
+    first = save_artifact(directory, MODEL, {'momentum_scale': 1.0}, {'weights': np.zeros(4)})
+    second = save_artifact(directory, MODEL, {'momentum_scale': 2.0}, {'weights': np.ones(4)})
+    third = save_artifact(directory, MODEL, {'momentum_scale': 3.0}, {'weights': np.full(4, 3.0)})
+
+    path = artifact_path(directory, MODEL)
+    assert current_version(path) == third
+    versions = sorted(name for name in os.listdir(path) if name.startswith(VERSION_PREFIX))
+    assert versions == sorted(os.path.basename(version) for version in (second, third))
+    assert not os.path.exists(first)
+
+    model = ModelRegistry(directory).get(MODEL)
+    assert model.params == {'momentum_scale': 3.0}
+    assert model.arrays['weights'].tolist() == [3.0] * 4
+
+
+def test_readers_never_fall_back_while_an_artifact_is_republished(tmp_path):
+    directory = str(tmp_path)
+    save_artifact(directory, MODEL, {'momentum_scale': 0.0}, {'weights': np.zeros(8)})
+    stop = threading.Event()
+    seen, errors = [], []
+
+    def read():
+        while not stop.is_set():
+            try:
+                seen.append(ModelRegistry(directory).get(MODEL).params.get('momentum_scale'))
+            except Exception as exc:
+                errors.append(exc)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(1, 40):
+            save_artifact(directory, MODEL, {'momentum_scale': float(i)}, {'weights': np.full(8, i)})
+    finally:
+        stop.set()
+        reader.join()
+    assert errors == []
+    assert seen and None not in seen
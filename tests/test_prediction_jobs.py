@@ -0,0 +1,59 @@
+"""PredictionJobs holder bookkeeping and cancellation."""
+import threading
+from services.prediction_jobs import PredictionJobs
+
+
+class PassThroughCache:
+    def get_or_compute(self, user_inputs, compute):
+        return compute()
+
+
+class BlockingClient:
+    """Holds the single worker on the 'blocker' asset until released"""
+
+    def __init__(self):
+        self.unblock = threading.Event()
+
+    def predict(self, user_inputs, progress_callback=None):
+        if user_inputs['selected_asset'] == 'blocker':
+            self.unblock.wait(5)
+        return {'predicted_price': 1.0}
+
+
+def inputs(asset):
+    return {'selected_asset': asset, 'prediction_horizon': '1 Hour', 'model_type': 'XGBoost'}
+
+
+def make_jobs():
+    client = BlockingClient()
+    jobs = PredictionJobs(PassThroughCache(), client, workers=1, abandon_after=60, result_ttl=60)
+    # Occupy the only worker so later jobs stay queued
+    jobs.submit(inputs('blocker'), 'other-session')
+    return jobs, client
+
+
+def test_resubmit_then_release_cancels_the_queued_job():
+    jobs, client = make_jobs()
+    try:
+        job_id = jobs.submit(inputs('BTC/USD'), 'session-a')
+        assert jobs.submit(inputs('BTC/USD'), 'session-a') == job_id
+        jobs.release(job_id, 'session-a')
+        assert jobs.status(job_id)['state'] == 'cancelled'
+    finally:
+        client.unblock.set()
+        jobs.shutdown()
+
+
+def test_job_shared_by_two_sessions_runs_until_both_release():
+    jobs, client = make_jobs()
+    try:
+        job_id = jobs.submit(inputs('ETH/USD'), 'session-a')
+        assert jobs.submit(inputs('ETH/USD'), 'session-b') == job_id
+        jobs.release(job_id, 'session-a')
+        assert jobs.status(job_id)['state'] == 'queued'
+        jobs.release(job_id, 'session-b')
+        assert jobs.status(job_id)['state'] == 'cancelled'
+        assert jobs.stats()['deduplicated'] == 1
+    finally:
+        client.unblock.set()
+        jobs.shutdown()
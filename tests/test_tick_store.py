@@ -0,0 +1,26 @@
+"""Live tick indicators against the batch indicator helper."""
+import numpy as np
+from utils.helpers import calculate_technical_indicators
+from utils.tick_store import TickStore
+
+COLUMNS = ('price', 'sma_20', 'sma_50', 'rsi')
+
+
+def test_live_indicators_match_batch_across_reads_and_gaps():
+    rng = np.random.default_rng(3)
+    store = TickStore(assets=['BTC'], capacity=4096)
+    assert store.live_indicators('BTC') is None
+
+    mids = np.empty(0)
+    # Small batches are fed incrementally; the 3000-tick one forces a restart
+    for size in (1, 30, 0, 120, 7, 3000, 45, 260):
+        bids = 100 + np.cumsum(rng.normal(0, 0.1, size))
+        asks = bids + 0.02
+        start = len(mids)
+        store.append_many('BTC', np.arange(start, start + size), bids, asks, np.ones(size))
+        mids = np.concatenate([mids, (bids + asks) / 2])
+
+        latest = store.live_indicators('BTC')
+        expected = calculate_technical_indicators({'price': mids}).iloc[-1]
+        for column in COLUMNS:
+            assert np.isclose(latest[column], expected[column], equal_nan=True), (size, column)
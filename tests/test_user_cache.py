@@ -0,0 +1,60 @@
+"""UserRecordCache invalidation races and record isolation."""
+import pytest
+from utils.user_cache import UserRecordCache
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = UserRecordCache()
+    records = {'alice': {'email': 'old@example.com'}}
+
+    def stale_loader(username):
+        record = dict(records[username])
+        # A write lands (and invalidates) while this load is in flight
+        records[username] = {'email': 'new@example.com'}
+        cache.invalidate(username)
+        return record
+
+    assert cache.get_or_load('alice', stale_loader)['email'] == 'old@example.com'
+    fresh = cache.get_or_load('alice', lambda username: dict(records[username]))
+    assert fresh['email'] == 'new@example.com'
+
+
+def test_global_invalidation_also_discards_in_flight_loads():
+    cache = UserRecordCache()
+
+    def loader(username):
+        cache.invalidate()
+        return {'name': username}
+
+    cache.get_or_load('bob', loader)
+    assert cache.stats()['size'] == 0
+
+
+def test_returned_records_are_copies():
+    cache = UserRecordCache()
+    loader = lambda username: {'preferences': {'theme': 'dark'}}
+
+    first = cache.get_or_load('carol', loader)
+    first['preferences']['theme'] = 'light'
+    second = cache.get_or_load('carol', loader)
+    second['email'] = 'x@example.com'
+
+    third = cache.get_or_load('carol', loader)
+    assert third == {'preferences': {'theme': 'dark'}}
+    assert cache.stats()['hits'] == 2
+
+
+def test_invalidation_bookkeeping_is_dropped_once_loads_finish():
+    cache = UserRecordCache()
+    for i in range(100):
+        username = f'user{i}'
+        cache.get_or_load(username, lambda name: {'name': name})
+        cache.invalidate(username)
+
+    def racing_loader(username):
+        cache.invalidate(username)
+        raise RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load('dave', racing_loader)
+    assert cache._loading == {}
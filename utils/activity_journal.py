@@ -0,0 +1,288 @@
+import json
+import os
+import threading
+from collections import deque
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+COMPACTION_MARKER = "compaction.json"
+
+
+class ActivityJournal:
+    """Append-only activity log stored as newline-delimited JSON segments.
+
+    Every record is one compact JSON line appended to the active segment.
+    An in-memory index keeps the (segment, offset, length) of each user's
+    most recent records, so reads only touch the requested user's tail.
+    Records pushed out of the retention window stay on disk until a
+    background compaction rewrites the sealed segments. A compaction marker
+    lets a restart finish one that crashed between replacing the oldest
+    segment and deleting the rest, so no record is replayed twice.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory, retention=100, segment_max_bytes=4 * 1024 * 1024,
+                 compaction_threshold=5000):
+        self.directory = directory
+        self.retention = retention
+        self.segment_max_bytes = segment_max_bytes
+        self.compaction_threshold = compaction_threshold
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._index = {}
+        self._dead_records = 0
+        self._compaction_thread = None
+        self._active_id = None
+        self._active_file = None
+        self._active_size = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover_compaction()
+        self._rebuild_index()
+        self._open_active_segment()
+
+    @classmethod
+    def open(cls, directory, **kwargs):
+        """Return the process-wide journal for a directory"""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            journal = cls._instances.get(key)
+            if journal is None:
+                journal = cls(directory, **kwargs)
+                cls._instances[key] = journal
+            return journal
+
+    def is_empty(self):
+        """Check whether the journal holds any records"""
+        with self._lock:
+            return not self._index
+
+    def usernames(self):
+        """Users that have at least one retained record"""
+        with self._lock:
+            return list(self._index)
+
+    def seed_if_empty(self, load_records):
+        """Append the records returned by load_records if the journal is empty"""
+        with self._lock:
+            if self._index:
+                return False
+            self.append_many(load_records())
+            return True
+
+    def append(self, username, entry):
+        """Append one activity entry for a user"""
+        self.append_many([(username, entry)])
+
+    def append_many(self, records):
+        """Append several (username, entry) pairs with a single write"""
+        lines = []
+        for username, entry in records:
+            record = dict(entry, username=username)
+            lines.append((username, self._encode(record)))
+
+        if not lines:
+            return
+
+        with self._lock:
+            if self._active_size >= self.segment_max_bytes:
+                self._rotate_segment()
+
+            offset = self._active_size
+            for username, line in lines:
+                self._add_to_index(username, (self._active_id, offset, len(line)))
+                offset += len(line)
+
+            self._active_file.write(b"".join(line for _, line in lines))
+            self._active_file.flush()
+            self._active_size = offset
+
+            if self._dead_records >= self.compaction_threshold:
+                self._start_compaction()
+
+    def tail(self, username, limit=50):
+        """Read the most recent entries for a single user"""
+        with self._lock:
+            positions = list(self._index.get(username, ()))[-limit:] if limit > 0 else []
+            entries = []
+            handles = {}
+            try:
+                for segment_id, offset, length in positions:
+                    handle = handles.get(segment_id)
+                    if handle is None:
+                        handle = open(self._segment_path(segment_id), "rb")
+                        handles[segment_id] = handle
+                    handle.seek(offset)
+                    record = json.loads(handle.read(length))
+                    record.pop("username", None)
+                    entries.append(record)
+            finally:
+                for handle in handles.values():
+                    handle.close()
+            return entries
+
+    def compact(self):
+        """Rewrite sealed segments keeping only records inside the retention window"""
+        with self._compaction_lock:
+            self._compact_sealed_segments()
+
+    def _compact_sealed_segments(self):
+        """Copy live records of every sealed segment into the oldest one"""
+        with self._lock:
+            self._rotate_segment()
+            sealed = self._segment_ids()[:-1]
+            if not sealed:
+                return
+            live = {}
+            for username, positions in self._index.items():
+                for position in positions:
+                    if position[0] in sealed:
+                        live.setdefault(position[0], []).append((position, username))
+            dead_before = self._dead_records
+
+        # Copy live records outside the lock; appends only touch the active segment
+        target_id = sealed[0]
+        tmp_path = self._segment_path(target_id) + ".compact"
+        relocated = {}
+        with open(tmp_path, "wb") as out:
+            new_offset = 0
+            for segment_id in sealed:
+                records = sorted(live.get(segment_id, []), key=lambda item: item[0][1])
+                if not records:
+                    continue
+                with open(self._segment_path(segment_id), "rb") as src:
+                    for position, _ in records:
+                        src.seek(position[1])
+                        data = src.read(position[2])
+                        out.write(data)
+                        relocated[position] = (target_id, new_offset, position[2])
+                        new_offset += position[2]
+
+        with self._lock:
+            for username, positions in self._index.items():
+                self._index[username] = deque(
+                    (relocated.get(position, position) for position in positions),
+                    maxlen=self.retention
+                )
+            # From here on a restart rolls the compaction forward (see _recover_compaction)
+            self._write_marker({'target': target_id, 'sealed': sealed})
+            self._finish_compaction(target_id, sealed)
+            self._dead_records = max(0, self._dead_records - dead_before)
+
+    def close(self):
+        """Close the active segment file"""
+        with self._lock:
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
+
+    def _start_compaction(self):
+        """Kick off compaction in a daemon thread if none is running"""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name="activity-journal-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def _finish_compaction(self, target_id, sealed):
+        """Swap the compacted copy in, drop the segments it replaces, then the marker"""
+        tmp_path = self._segment_path(target_id) + ".compact"
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, self._segment_path(target_id))
+        for segment_id in sealed[1:]:
+            path = self._segment_path(segment_id)
+            if os.path.exists(path):
+                os.remove(path)
+        os.remove(os.path.join(self.directory, COMPACTION_MARKER))
+
+    def _recover_compaction(self):
+        """Finish a compaction that was interrupted after its marker was written"""
+        marker_path = os.path.join(self.directory, COMPACTION_MARKER)
+        if os.path.exists(marker_path):
+            with open(marker_path) as f:
+                marker = json.load(f)
+            self._finish_compaction(marker['target'], marker['sealed'])
+        # A copy that never got a marker is incomplete; its sources are intact
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX + ".compact"):
+                os.remove(os.path.join(self.directory, name))
+
+    def _write_marker(self, marker):
+        """Atomically record the compaction being committed"""
+        path = os.path.join(self.directory, COMPACTION_MARKER)
+        with open(path + ".tmp", "w") as f:
+            json.dump(marker, f)
+        os.replace(path + ".tmp", path)
+
+    def _add_to_index(self, username, position):
+        """Track a record position, counting the one it pushes out as dead"""
+        positions = self._index.get(username)
+        if positions is None:
+            positions = deque(maxlen=self.retention)
+            self._index[username] = positions
+        if len(positions) == self.retention:
+            self._dead_records += 1
+        positions.append(position)
+
+    def _rebuild_index(self):
+        """Scan existing segments to restore the per-user index"""
+        for segment_id in self._segment_ids():
+            path = self._segment_path(segment_id)
+            offset = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn write from a crash; the partial record is truncated below
+                        break
+                    try:
+                        username = json.loads(line)["username"]
+                    except (ValueError, KeyError):
+                        offset += len(line)
+                        self._dead_records += 1
+                        continue
+                    self._add_to_index(username, (segment_id, offset, len(line)))
+                    offset += len(line)
+            if offset != os.path.getsize(path):
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+
+    def _open_active_segment(self):
+        """Open the newest segment for appending"""
+        segment_ids = self._segment_ids()
+        self._active_id = segment_ids[-1] if segment_ids else 1
+        path = self._segment_path(self._active_id)
+        self._active_file = open(path, "ab")
+        self._active_size = self._active_file.tell()
+
+    def _rotate_segment(self):
+        """Seal the active segment and start a new one"""
+        if self._active_size == 0:
+            return
+        self._active_file.close()
+        self._active_id += 1
+        self._active_file = open(self._segment_path(self._active_id), "ab")
+        self._active_size = 0
+
+    def _segment_ids(self):
+        """List segment ids on disk in ascending order"""
+        ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    ids.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(ids)
+
+    def _segment_path(self, segment_id):
+        """Path of a segment file"""
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment_id:08d}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _encode(record):
+        """Encode a record as one compact JSON line"""
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+from config.settings import (
+    ACTIVITY_QUEUE_SIZE, ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_INTERVAL, ACTIVITY_ENQUEUE_TIMEOUT,
+    ACTIVITY_FLUSH_RETRIES, ACTIVITY_RETRY_BACKOFF
+)
+
+_STOP = object()
+
+
+class ActivityWriter:
+    """Queue activity events and write them to the UserDatabase in batches.
+
+    A single daemon thread drains a bounded queue and flushes whenever the
+    batch reaches ``batch_size`` or ``flush_interval`` seconds have passed.
+    When the queue is full, callers wait up to ``enqueue_timeout`` and then
+    write synchronously, so events are never dropped. A failed batch is
+    retried with backoff and then written record by record; only records
+    that still fail are counted in ``flush_errors``.
+    """
+
+    def __init__(self, user_db, max_queue_size=ACTIVITY_QUEUE_SIZE,
+                 batch_size=ACTIVITY_BATCH_SIZE, flush_interval=ACTIVITY_FLUSH_INTERVAL,
+                 enqueue_timeout=ACTIVITY_ENQUEUE_TIMEOUT, flush_retries=ACTIVITY_FLUSH_RETRIES,
+                 retry_backoff=ACTIVITY_RETRY_BACKOFF):
+        self.user_db = user_db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.flush_retries = flush_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'blocked_puts': 0,
+            'sync_writes': 0,
+            'flush_retries': 0,
+            'flush_errors': 0,
+            'max_queue_depth': 0,
+            'last_flush_seconds': 0.0
+        }
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        # Guards _stopped against enqueues, and _closed against late ones
+        self._state_lock = threading.Lock()
+        self._stopped = False
+        self._closed = False
+        self._thread.start()
+
+    def log(self, username, activity_type, details=None):
+        """Queue one activity; timestamped now, written later"""
+        record = (username, self.user_db.build_activity_entry(activity_type, details))
+
+        with self._state_lock:
+            if self._stopped:
+                queued = None
+            else:
+                try:
+                    self._queue.put_nowait(record)
+                    queued = True
+                except queue.Full:
+                    queued = False
+        if queued is None:
+            self._write_sync(record)
+            return
+
+        if not queued:
+            self._count('blocked_puts')
+            try:
+                self._queue.put(record, timeout=self.enqueue_timeout)
+            except queue.Full:
+                self._write_sync(record)
+                return
+            # A blocking put can land after shutdown's final drain; write it inline then
+            with self._state_lock:
+                if self._closed:
+                    self._flush(self._drain())
+
+        with self._metrics_lock:
+            self._metrics['enqueued'] += 1
+            depth = self._queue.qsize()
+            if depth > self._metrics['max_queue_depth']:
+                self._metrics['max_queue_depth'] = depth
+
+    def metrics(self):
+        """Snapshot of queue depth and throughput counters"""
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        snapshot['queue_depth'] = self._queue.qsize()
+        snapshot['queue_capacity'] = self._queue.maxsize
+        return snapshot
+
+    def shutdown(self, timeout=5.0):
+        """Flush pending events and stop the writer thread"""
+        with self._state_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+        # Events that raced with shutdown are written inline
+        with self._state_lock:
+            self._flush(self._drain())
+            self._closed = True
+
+    def _drain(self):
+        """Everything currently queued, without the stop marker"""
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _STOP:
+                items.append(item)
+
+    def _run(self):
+        """Writer loop: collect a batch until it is full or the interval elapses"""
+        while True:
+            batch = []
+            stop = False
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stop:
+                # Drain whatever arrived before shutdown
+                batch.extend(self._drain())
+
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        """Write one batch through the UserDatabase"""
+        if not batch:
+            return
+        started = time.perf_counter()
+        delay = self.retry_backoff
+        for attempt in range(self.flush_retries + 1):
+            try:
+                self.user_db.log_user_activities(batch)
+            except Exception:
+                if attempt == self.flush_retries:
+                    break
+                self._count('flush_retries')
+                time.sleep(delay)
+                delay *= 2
+            else:
+                with self._metrics_lock:
+                    self._metrics['written'] += len(batch)
+                    self._metrics['batches'] += 1
+                    self._metrics['last_flush_seconds'] = time.perf_counter() - started
+                return
+
+        # The batch keeps failing: isolate the records that can't be written
+        for record in batch:
+            try:
+                self.user_db.log_user_activities([record])
+            except Exception:
+                self._count('flush_errors')
+            else:
+                self._count('written')
+
+    def _write_sync(self, record):
+        """Fallback path when the queue is saturated or stopped"""
+        self._count('sync_writes')
+        self.user_db.log_user_activities([record])
+
+    def _count(self, name):
+        """Increment a metrics counter"""
+        with self._metrics_lock:
+            self._metrics[name] += 1
+
@@ -0,0 +1,149 @@
+"""Vectorized simulation of the trading recommendation strategy.
+
+Arrays are shaped (assets, bars) and all assets share one bar grid. A trade
+opens every ``horizon_bars`` bars at the close, in the direction of the
+predicted change, with the target at the predicted price and the stop
+``stop_loss`` away from the entry. It exits at whichever is touched first
+(the stop when both fall in the same bar), or at the close ``horizon_bars``
+later. Every parameter set is evaluated in the same pass.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EXIT_HORIZON, EXIT_TARGET, EXIT_STOP = 0, 1, 2
+
+
+def lagged_window_sum(values, step, count):
+    """Sum of ``values[t - k*step]`` for k < count at every t (NaN where incomplete)"""
+    assets, bars = values.shape
+    padded_bars = -(-bars // step) * step
+    padded = np.zeros((assets, padded_bars))
+    padded[:, :bars] = np.nan_to_num(values)
+
+    # Each residue class mod ``step`` is its own series; cumsum them all at once
+    by_residue = padded.reshape(assets, -1, step)
+    cumulative = np.cumsum(by_residue, axis=1).reshape(assets, padded_bars)[:, :bars]
+
+    out = np.full((assets, bars), np.nan)
+    span = count * step
+    if span - step < bars:
+        out[:, span - step:] = cumulative[:, span - step:]
+    if span < bars:
+        out[:, span:] -= cumulative[:, :bars - span]
+    return out
+
+
+def horizon_features(close, horizon_bars, momentum_bars, volatility_bars):
+    """Per-bar model inputs matching AIPredictor._build_features on horizon bars.
+
+    A horizon bar at t closes at ``close[t]``, so its return is
+    ``close[t] / close[t - horizon_bars] - 1``. Momentum averages the last
+    ``momentum_bars`` of those returns and volatility is the standard
+    deviation of the last ``volatility_bars``; both are NaN until enough
+    history exists.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.full(close.shape, np.nan)
+    returns[:, horizon_bars:] = close[:, horizon_bars:] / close[:, :-horizon_bars] - 1
+
+    momentum = lagged_window_sum(returns, horizon_bars, momentum_bars) / momentum_bars
+    momentum[:, :momentum_bars * horizon_bars] = np.nan
+
+    mean = lagged_window_sum(returns, horizon_bars, volatility_bars) / volatility_bars
+    mean_square = lagged_window_sum(returns ** 2, horizon_bars, volatility_bars) / volatility_bars
+    volatility = np.sqrt(np.maximum(mean_square - mean ** 2, 0))
+    volatility[:, :volatility_bars * horizon_bars] = np.nan
+    return {'current_price': close, 'momentum': momentum, 'volatility': volatility}
+
+
+def entry_bars(start, stop, horizon_bars, warmup_bars, total_bars):
+    """Entry bar indices in [start, stop) on the global horizon grid"""
+    first = max(start, warmup_bars)
+    first += (-first) % horizon_bars
+    last = min(stop, total_bars - horizon_bars)
+    return np.arange(first, last, horizon_bars)
+
+
+def _first_hit(mask, horizon_bars):
+    """Index of the first True along the last axis, or ``horizon_bars`` if none"""
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), horizon_bars)
+
+
+def simulate_trades(high, low, close, predicted_change, entries, horizon_bars,
+                    stop_losses, min_edges, fee=0.0):
+    """Trade outcomes for every (stop_loss, min_edge) pair.
+
+    Returns arrays shaped (len(stop_losses), len(min_edges), assets, entries):
+    ``returns`` (net of ``fee`` per side, 0 when no trade) and ``exits`` (an
+    EXIT_* code, -1 when no trade).
+    """
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    stop_losses = np.asarray(stop_losses, dtype=np.float64)
+    min_edges = np.asarray(min_edges, dtype=np.float64)
+    shape = (len(stop_losses), len(min_edges), close.shape[0], len(entries))
+    if len(entries) == 0:
+        return {'returns': np.zeros(shape), 'exits': np.full(shape, -1, dtype=np.int8)}
+
+    entry_price = close[:, entries]
+    change = np.nan_to_num(predicted_change[:, entries])
+    side = np.sign(change)
+    target = entry_price * (1 + change)
+    exit_close = close[:, entries + horizon_bars]
+
+    # The bars after each entry, as (assets, entries, horizon_bars) copies of strided views
+    path_high = sliding_window_view(high[:, 1:], horizon_bars, axis=1)[:, entries]
+    path_low = sliding_window_view(low[:, 1:], horizon_bars, axis=1)[:, entries]
+    long = (side > 0)[..., None]
+
+    target_bar = _first_hit(
+        np.where(long, path_high >= target[..., None], path_low <= target[..., None]), horizon_bars
+    )
+
+    # Stops for every stop_loss at once: (stops, assets, entries)
+    stop = entry_price * (1 - side * stop_losses[:, None, None])
+    stop_bar = _first_hit(
+        np.where(long, path_low[None] <= stop[..., None], path_high[None] >= stop[..., None]),
+        horizon_bars
+    )
+
+    stopped = (stop_bar <= target_bar) & (stop_bar < horizon_bars)
+    reached = ~stopped & (target_bar < horizon_bars)
+    exit_price = np.where(stopped, stop, np.where(reached, target, exit_close))
+    exits = np.where(stopped, EXIT_STOP, np.where(reached, EXIT_TARGET, EXIT_HORIZON)).astype(np.int8)
+    gross = side * (exit_price / entry_price - 1) - 2 * fee
+
+    # Trades only open when the predicted move clears each min_edge
+    traded = (side != 0) & (np.abs(change) >= min_edges[:, None, None])
+    returns = np.where(traded[None], gross[:, None], 0.0)
+    exits = np.where(traded[None], exits[:, None], -1).astype(np.int8)
+    return {'returns': returns, 'exits': exits}
+
+
+def equity_curve(slot_returns):
+    """Compounded equity and drawdown from per-slot portfolio returns"""
+    equity = np.cumprod(1 + slot_returns, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+    return equity, drawdown
+
+
+def trade_stats(returns, exits, periods_per_year):
+    """Summary statistics for trades shaped (..., assets, entries)"""
+    traded = exits >= 0
+    trades = traded.sum(axis=(-2, -1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Equal weight per asset; an asset without a trade holds cash that slot
+        slot_returns = returns.mean(axis=-2)
+        equity, drawdown = equity_curve(slot_returns)
+        wins = ((returns > 0) & traded).sum(axis=(-2, -1))
+        slot_std = slot_returns.std(axis=-1)
+        return {
+            'total_return': equity[..., -1] - 1 if equity.shape[-1] else np.zeros(trades.shape),
+            'max_drawdown': drawdown.min(axis=-1) if drawdown.shape[-1] else np.zeros(trades.shape),
+            'hit_rate': wins / trades,
+            'trades': trades,
+            'avg_trade_return': np.where(traded, returns, 0).sum(axis=(-2, -1)) / trades,
+            'target_rate': (exits == EXIT_TARGET).sum(axis=(-2, -1)) / trades,
+            'stop_rate': (exits == EXIT_STOP).sum(axis=(-2, -1)) / trades,
+            'sharpe': np.where(slot_std > 0, slot_returns.mean(axis=-1) / slot_std, np.nan)
+                      * np.sqrt(periods_per_year)
+        }
@@ -0,0 +1,74 @@
+"""Reduce long price series to a fixed point budget before plotting.
+
+Both decimators return the indices of the points to keep, in order and
+always including the first and last point, so any aligned column can be
+sliced with the same result. ``lttb`` (Largest-Triangle-Three-Buckets)
+keeps the visual shape of a line; ``minmax`` keeps the exact high and low
+of every bucket.
+"""
+import numpy as np
+
+
+def lttb(x, y, budget):
+    """Indices of the ``budget`` points picked by Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if budget >= n or budget < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Interior points 1..n-2 split into budget-2 buckets
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Each bucket is scored against the mean of the next bucket (or the last point)
+    sizes = ends - starts
+    next_x = np.empty(budget - 2)
+    next_y = np.empty(budget - 2)
+    next_x[:-1] = (np.add.reduceat(x[1:n - 1], starts - 1) / sizes)[1:]
+    next_y[:-1] = (np.add.reduceat(y[1:n - 1], starts - 1) / sizes)[1:]
+    next_x[-1] = x[-1]
+    next_y[-1] = y[-1]
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i, (lo, hi) in enumerate(zip(starts.tolist(), ends.tolist())):
+        # Twice the triangle area for every candidate in the bucket at once
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x, y, budget):
+    """Indices of the lowest and highest point in each of ``budget // 2`` buckets"""
+    n = len(x)
+    if budget >= n or budget < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+
+    buckets = budget // 2 - 1
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+    interior = np.arange(1, n - 1)
+
+    # Sort by (bucket, value): each bucket's first entry is its min, last its max
+    order = interior[np.lexsort((y[1:n - 1], bucket_ids))]
+    first = edges[:-1] - 1
+    last = edges[1:] - 2
+    picks = np.concatenate(([0], order[first], order[last], [n - 1]))
+    return np.unique(picks)
+
+
+DECIMATORS = {'lttb': lttb, 'minmax': minmax}
+
+
+def downsample(x, y, budget, method='lttb'):
+    """``(x, y)`` reduced to at most ``budget`` points"""
+    indices = DECIMATORS[method](x, y, budget)
+    if len(indices) == len(x):
+        return x, y
+    return x[indices], y[indices]
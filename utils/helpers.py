@@ -1,12 +1,4 @@
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-
-def generate_mock_data(days=30, base_price=100):
-    """Generate mock historical price data"""
-    dates = pd.date_range(start=datetime.now() - timedelta(days=days), periods=days, freq='D')
-    prices = base_price + np.cumsum(np.random.randn(days) * 2)
-    return pd.DataFrame({'date': dates, 'price': prices})
 
 def calculate_technical_indicators(prices):
     """Calculate basic technical indicators"""
@@ -0,0 +1,188 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+import numpy as np
+from config.settings import HISTORY_DATA_DIR, HISTORY_BAR_SECONDS, HISTORY_SEED_BARS
+
+# Column name -> on-disk dtype; timestamps are epoch seconds
+COLUMNS = {
+    'timestamp': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<f8')
+}
+
+
+def asset_slug(asset):
+    """Filesystem-safe directory name for an asset symbol"""
+    return re.sub(r'[^a-z0-9]+', '_', asset.lower()).strip('_')
+
+
+class HistoryStore:
+    """Per-asset columnar OHLCV bars stored as flat fixed-width files.
+
+    Each asset has one file per column under ``<directory>/<slug>/``.
+    Files are opened read-only with ``np.memmap``, so range queries return
+    zero-copy slices and only the pages that are touched get loaded.
+    Assets without history are seeded with a reproducible synthetic series
+    until a real feed fills them.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory=HISTORY_DATA_DIR, bar_seconds=HISTORY_BAR_SECONDS,
+                 seed_bars=HISTORY_SEED_BARS):
+        self.directory = directory
+        self.bar_seconds = bar_seconds
+        self.seed_bars = seed_bars
+        self._maps = {}
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @classmethod
+    def open(cls, directory=HISTORY_DATA_DIR, **kwargs):
+        """Return the process-wide store for a directory"""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(directory, **kwargs)
+                cls._instances[key] = store
+            return store
+
+    def columns(self, asset):
+        """All bars for an asset as a dict of read-only memmapped arrays"""
+        with self._lock:
+            mapped = self._maps.get(asset)
+            if mapped is None:
+                mapped = self._map_columns(asset)
+                self._maps[asset] = mapped
+            return mapped
+
+    def range(self, asset, start=None, end=None):
+        """Bars with start <= timestamp < end (epoch seconds) as zero-copy slices"""
+        columns = self.columns(asset)
+        timestamps = columns['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def tail(self, asset, count):
+        """The most recent ``count`` bars as zero-copy slices"""
+        columns = self.columns(asset)
+        return {name: column[-count:] if count > 0 else column[:0]
+                for name, column in columns.items()}
+
+    def version(self, asset):
+        """Number of stored bars; changes whenever bars are appended"""
+        return len(self.columns(asset)['timestamp'])
+
+    def append(self, asset, bars):
+        """Append bars (dict of equal-length arrays) newer than the last stored one"""
+        timestamps = np.asarray(bars['timestamp'], dtype=COLUMNS['timestamp'])
+        if len(timestamps) == 0:
+            return
+        if any(len(bars[name]) != len(timestamps) for name in COLUMNS):
+            raise ValueError("Bar columns must all have the same length")
+        if np.any(np.diff(timestamps) <= 0):
+            raise ValueError("Bar timestamps must be strictly increasing")
+
+        with self._lock:
+            existing = self.columns(asset)['timestamp']
+            if len(existing) and timestamps[0] <= existing[-1]:
+                raise ValueError(f"Bars for {asset} must be newer than the last stored bar")
+
+            asset_dir = self._asset_dir(asset)
+            os.makedirs(asset_dir, exist_ok=True)
+            # Drop the tail of an earlier append that failed partway, so every
+            # column resumes from the same row
+            self._truncate_to_committed(asset_dir)
+            for name, dtype in COLUMNS.items():
+                with open(os.path.join(asset_dir, f"{name}.bin"), 'ab') as f:
+                    f.write(np.ascontiguousarray(bars[name], dtype=dtype).tobytes())
+
+            # Remap so readers see the new length; old slices stay valid
+            self._maps.pop(asset, None)
+
+    def _map_columns(self, asset):
+        """Memory-map an asset's column files, seeding them first if missing"""
+        asset_dir = self._asset_dir(asset)
+        if not os.path.isdir(asset_dir):
+            self._seed(asset)
+
+        rows = self._committed_rows(asset_dir)
+        mapped = {}
+        for name, dtype in COLUMNS.items():
+            if rows == 0:
+                mapped[name] = np.empty(0, dtype=dtype)
+            else:
+                mapped[name] = np.memmap(
+                    os.path.join(asset_dir, f"{name}.bin"), dtype=dtype, mode='r', shape=(rows,)
+                )
+        return mapped
+
+    @staticmethod
+    def _committed_rows(asset_dir):
+        """Rows present in every column file (a failed append can leave some longer)"""
+        rows = []
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(asset_dir, f"{name}.bin")
+            rows.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(rows)
+
+    def _truncate_to_committed(self, asset_dir):
+        """Cut every column file back to the committed row count"""
+        rows = self._committed_rows(asset_dir)
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(asset_dir, f"{name}.bin")
+            if os.path.exists(path) and os.path.getsize(path) != rows * dtype.itemsize:
+                os.truncate(path, rows * dtype.itemsize)
+
+    def _seed(self, asset):
+        """Write a reproducible synthetic history for an asset"""
+        bars = synthetic_bars(asset, self.seed_bars, self.bar_seconds)
+
+        # Build in a temporary directory and rename so readers never see partial files
+        tmp_dir = tempfile.mkdtemp(prefix=".seed-", dir=self.directory)
+        for name, dtype in COLUMNS.items():
+            bars[name].astype(dtype).tofile(os.path.join(tmp_dir, f"{name}.bin"))
+        try:
+            os.rename(tmp_dir, self._asset_dir(asset))
+        except OSError:
+            # Another process seeded it first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _asset_dir(self, asset):
+        """Directory holding an asset's column files"""
+        return os.path.join(self.directory, asset_slug(asset))
+
+
+def synthetic_bars(asset, count, bar_seconds, end=None):
+    """Reproducible geometric random-walk OHLCV bars ending at ``end``"""
+    seed = zlib.crc32(asset.encode('utf-8'))
+    rng = np.random.default_rng(seed)
+    base_price = 50 + (seed % 15000) / 100
+
+    end = int(end if end is not None else time.time()) // bar_seconds * bar_seconds
+    timestamps = end - bar_seconds * np.arange(count - 1, -1, -1, dtype=np.int64)
+
+    volatility = 0.004 * np.sqrt(bar_seconds / 3600)
+    close = base_price * np.exp(np.cumsum(rng.normal(0, volatility, count)))
+    open_ = np.concatenate(([base_price], close[:-1]))
+    spread = np.abs(rng.normal(0, volatility / 2, (2, count)))
+
+    return {
+        'timestamp': timestamps,
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + spread[0]),
+        'low': np.minimum(open_, close) * (1 - spread[1]),
+        'close': close,
+        'volume': rng.lognormal(10, 0.5, count)
+    }
@@ -0,0 +1,127 @@
+"""Import-time profile of the app's cold start.
+
+Runs the entry point in a fresh interpreter with ``python -X importtime``
+and reports the cumulative import cost per module. ``--budget`` and the
+forbidden-module check make it usable as a startup regression gate.
+
+Usage: python -m utils.import_profiler [--target login] [--top 25] [--budget 1500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from config.settings import STARTUP_IMPORT_BUDGET_MS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PARTY = ('main', 'config', 'components', 'services', 'styles', 'utils')
+
+# Code run for each target; "login" renders the auth page in Streamlit's bare mode
+TARGETS = {
+    'import': "import main",
+    'login': "import main; main.main()",
+    'app': ("import main, components.sidebar, components.charts, components.metrics, "
+            "components.screener, components.backtest, services.ai_predictor")
+}
+
+# Modules the login page must render without
+LOGIN_FORBIDDEN = (
+    'numpy', 'pandas', 'plotly.express',
+    'components.charts', 'components.metrics', 'components.screener', 'components.backtest',
+    'services.ai_predictor', 'services.backtester'
+)
+
+
+def profile_imports(code, python=sys.executable):
+    """Import records ({module, self_us, cumulative_us, depth}) for running ``code``"""
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiled code failed:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        module = name.strip()
+        records.append({
+            'module': module,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            # Nesting is shown as two spaces per level after the first
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2
+        })
+    return records
+
+
+def best_of(code, runs):
+    """Profile ``runs`` times and keep the fastest run (least scheduling noise)"""
+    profiles = [profile_imports(code) for _ in range(runs)]
+    return min(profiles, key=total_ms)
+
+
+def total_ms(records):
+    """Total import time: the sum of the top-level imports"""
+    return sum(r['cumulative_us'] for r in records if r['depth'] == 0) / 1000
+
+
+def is_first_party(module):
+    """Whether a module belongs to this app"""
+    return module.split('.')[0] in FIRST_PARTY
+
+
+def format_report(records, top=25):
+    """Plain-text table of the slowest top-level packages and app modules"""
+    roots = sorted((r for r in records if r['depth'] == 0),
+                   key=lambda r: r['cumulative_us'], reverse=True)[:top]
+    app_modules = sorted((r for r in records if is_first_party(r['module'])),
+                         key=lambda r: r['cumulative_us'], reverse=True)[:top]
+
+    lines = [f"Total import time: {total_ms(records):.1f} ms ({len(records)} modules)", ""]
+    for title, rows in (("Top-level imports", roots), ("App modules", app_modules)):
+        lines.append(f"{title:<48}{'cumulative ms':>14}{'self ms':>10}")
+        for r in rows:
+            lines.append(f"{r['module']:<48}{r['cumulative_us'] / 1000:>14.1f}{r['self_us'] / 1000:>10.1f}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def check(records, budget_ms=None, forbidden=()):
+    """Startup budget violations as a list of messages (empty when within budget)"""
+    problems = []
+    if budget_ms is not None and total_ms(records) > budget_ms:
+        problems.append(f"Import time {total_ms(records):.1f} ms exceeds the {budget_ms} ms budget")
+    loaded = {r['module'] for r in records}
+    for module in forbidden:
+        if module in loaded:
+            problems.append(f"{module} is imported but should load lazily")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the app's import-time cost")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="login",
+                        help="What to run: the login page (default), a bare import or the full app")
+    parser.add_argument("--top", type=int, default=25, help="Rows per report section")
+    parser.add_argument("--runs", type=int, default=3, help="Profile this many times and keep the fastest")
+    parser.add_argument("--budget", type=float, nargs='?', const=STARTUP_IMPORT_BUDGET_MS,
+                        help=f"Fail above this many ms (default {STARTUP_IMPORT_BUDGET_MS} when given bare)")
+    args = parser.parse_args()
+
+    records = best_of(TARGETS[args.target], args.runs)
+    print(format_report(records, args.top))
+
+    forbidden = LOGIN_FORBIDDEN if args.target == 'login' else ()
+    problems = check(records, args.budget, forbidden)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        sys.exit(1)
+    if args.budget is not None:
+        print(f"OK: within the {args.budget} ms startup budget")
+
+
+if __name__ == "__main__":
+    main()
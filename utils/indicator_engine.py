@@ -0,0 +1,187 @@
+"""Vectorized technical indicators over 2-D arrays shaped (assets, time).
+
+Every function works on the whole asset universe at once. Rolling windows
+use cumulative sums or strided views, and the recursive indicators (EMA,
+Wilder smoothing) step through time with each step vectorized across
+assets. Values that are undefined for the first bars are NaN, matching the
+pandas conventions used in utils.helpers.
+"""
+import threading
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from config.settings import MARKET_OPTIONS
+from utils.history_store import HistoryStore
+
+INDICATOR_LOOKBACK_BARS = 500
+
+
+def sma(values, window):
+    """Rolling mean, equal to pandas ``rolling(window).mean()`` per row"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return out
+    cumsum = np.cumsum(values, axis=1)
+    out[:, window - 1] = cumsum[:, window - 1]
+    out[:, window:] = cumsum[:, window:] - cumsum[:, :-window]
+    out[:, window - 1:] /= window
+    return out
+
+
+def rolling_std(values, window, ddof=1):
+    """Rolling standard deviation, equal to pandas ``rolling(window).std()``"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return out
+    out[:, window - 1:] = sliding_window_view(values, window, axis=1).std(axis=2, ddof=ddof)
+    return out
+
+
+def ema(values, span):
+    """Exponential moving average, equal to pandas ``ewm(span, adjust=False)``"""
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2 / (span + 1)
+    out = np.empty(values.shape)
+    out[:, 0] = values[:, 0]
+    for t in range(1, values.shape[1]):
+        out[:, t] = alpha * values[:, t] + (1 - alpha) * out[:, t - 1]
+    return out
+
+
+def wilder_smooth(values, window, start=0):
+    """Wilder smoothing seeded with the mean of ``window`` values from ``start``"""
+    out = np.full(values.shape, np.nan)
+    seed_end = start + window
+    if values.shape[1] < seed_end:
+        return out
+    out[:, seed_end - 1] = values[:, start:seed_end].mean(axis=1)
+    for t in range(seed_end, values.shape[1]):
+        out[:, t] = (out[:, t - 1] * (window - 1) + values[:, t]) / window
+    return out
+
+
+def rsi(close, window=14):
+    """Wilder RSI per row; NaN for the first ``window`` bars"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.zeros(close.shape)
+    delta[:, 1:] = np.diff(close, axis=1)
+    avg_gain = wilder_smooth(np.clip(delta, 0, None), window, start=1)
+    avg_loss = wilder_smooth(np.clip(-delta, 0, None), window, start=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD line, signal line and histogram per row"""
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, window=20, num_std=2):
+    """Middle, upper and lower Bollinger bands per row"""
+    middle = sma(close, window)
+    deviation = rolling_std(close, window) * num_std
+    return middle, middle + deviation, middle - deviation
+
+
+def atr(high, low, close, window=14):
+    """Average True Range with Wilder smoothing per row"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    true_range = high - low
+    previous_close = close[:, :-1]
+    true_range[:, 1:] = np.maximum.reduce([
+        true_range[:, 1:],
+        np.abs(high[:, 1:] - previous_close),
+        np.abs(low[:, 1:] - previous_close)
+    ])
+    return wilder_smooth(true_range, window)
+
+
+def ma_crossover(close, fast=20, slow=50):
+    """Fast-minus-slow moving average spread and crossover events per row.
+
+    ``crosses`` is +1 where the fast MA crosses above the slow MA, -1 where
+    it crosses below and 0 elsewhere.
+    """
+    fast_ma = sma(close, fast)
+    slow_ma = sma(close, slow)
+    spread = fast_ma - slow_ma
+    side = np.sign(spread)
+    crosses = np.zeros(side.shape, dtype=np.int8)
+    valid = ~np.isnan(side[:, 1:]) & ~np.isnan(side[:, :-1])
+    crosses[:, 1:] = np.where(valid, np.sign(side[:, 1:] - side[:, :-1]), 0)
+    return fast_ma, slow_ma, crosses
+
+
+def compute_indicators(high, low, close):
+    """Every indicator for a stack of assets; returns the latest value per asset"""
+    rsi_values = rsi(close)
+    macd_line, signal_line, histogram = macd(close)
+    fast_ma, slow_ma, crosses = ma_crossover(close)
+    middle, upper, lower = bollinger_bands(close)
+    atr_values = atr(high, low, close)
+
+    last_cross = np.where(
+        crosses.any(axis=1),
+        crosses[np.arange(len(crosses)), crosses.shape[1] - 1 - np.argmax(crosses[:, ::-1] != 0, axis=1)],
+        0
+    )
+    band_width = upper[:, -1] - lower[:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = (close[:, -1] - lower[:, -1]) / band_width
+
+    return {
+        'close': close[:, -1],
+        'rsi': rsi_values[:, -1],
+        'macd': macd_line[:, -1],
+        'macd_signal': signal_line[:, -1],
+        'macd_histogram': histogram[:, -1],
+        'sma_20': fast_ma[:, -1],
+        'sma_50': slow_ma[:, -1],
+        'last_crossover': last_cross,
+        'bollinger_upper': upper[:, -1],
+        'bollinger_lower': lower[:, -1],
+        'bollinger_percent_b': percent_b,
+        'atr': atr_values[:, -1],
+        'atr_percent': atr_values[:, -1] / close[:, -1]
+    }
+
+
+_snapshot_cache = {'key': None, 'value': None}
+_snapshot_lock = threading.Lock()
+
+
+def get_indicator_snapshot(store=None, lookback=INDICATOR_LOOKBACK_BARS):
+    """Latest indicators for every asset in MARKET_OPTIONS, keyed by asset.
+
+    Computed in one vectorized pass over the recent bars of the whole
+    universe and reused until any asset's history changes.
+    """
+    store = store or HistoryStore.open()
+    assets = [asset for market_assets in MARKET_OPTIONS.values() for asset in market_assets]
+    key = (store.directory, lookback) + tuple(store.version(asset) for asset in assets)
+
+    with _snapshot_lock:
+        if _snapshot_cache['key'] == key:
+            return _snapshot_cache['value']
+
+    tails = [store.tail(asset, lookback) for asset in assets]
+    bars = min(len(tail['close']) for tail in tails)
+    stacked = {
+        column: np.vstack([tail[column][len(tail[column]) - bars:] for tail in tails])
+        for column in ('high', 'low', 'close')
+    }
+    latest = compute_indicators(stacked['high'], stacked['low'], stacked['close'])
+    snapshot = {
+        asset: {name: float(values[i]) for name, values in latest.items()}
+        for i, asset in enumerate(assets)
+    }
+
+    with _snapshot_lock:
+        _snapshot_cache['key'] = key
+        _snapshot_cache['value'] = snapshot
+    return snapshot
@@ -0,0 +1,38 @@
+"""One-shot import of data/users.json and user activity into SQLite.
+
+Usage: python -m utils.migrate_json_to_sqlite [--db data/users.db]
+Then set STORAGE_BACKEND = "sqlite" in config/settings.py.
+"""
+import argparse
+from config.settings import SQLITE_DATABASE_PATH
+from utils.storage_backends import JSONStorageBackend, SQLiteStorageBackend
+
+def migrate(json_backend, sqlite_backend):
+    """Copy users and their retained activities, returning the counts"""
+    users = json_backend.load_users()
+    sqlite_backend.import_users(users)
+    
+    usernames = set(users) | set(json_backend.activity_usernames())
+    activity_count = 0
+    for username in usernames:
+        if sqlite_backend.get_activities(username, limit=1):
+            continue  # Already migrated
+        entries = json_backend.get_activities(username, limit=sqlite_backend.retention)
+        sqlite_backend.append_activities([(username, entry) for entry in entries])
+        activity_count += len(entries)
+    
+    return len(users), activity_count
+
+def main():
+    parser = argparse.ArgumentParser(description="Import JSON user data into SQLite")
+    parser.add_argument("--data-dir", default="data", help="Directory holding users.json")
+    parser.add_argument("--db", default=SQLITE_DATABASE_PATH, help="Target SQLite database")
+    args = parser.parse_args()
+    
+    user_count, activity_count = migrate(
+        JSONStorageBackend(args.data_dir), SQLiteStorageBackend(args.db)
+    )
+    print(f"Imported {user_count} users and {activity_count} activities into {args.db}")
+
+if __name__ == "__main__":
+    main()
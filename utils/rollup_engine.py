@@ -0,0 +1,191 @@
+import threading
+import numpy as np
+from config.settings import PREDICTION_HORIZONS
+from utils.history_store import HistoryStore
+
+# Bucket width in seconds, or a calendar rule for weeks (Monday start) and months
+HORIZON_BUCKETS = {
+    "1 Hour": 3600,
+    "4 Hours": 4 * 3600,
+    "1 Day": 24 * 3600,
+    "1 Week": "week",
+    "1 Month": "month"
+}
+
+WEEK_SECONDS = 7 * 24 * 3600
+EPOCH_TO_MONDAY = 3 * 24 * 3600  # 1970-01-01 was a Thursday
+
+FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+def bucket_starts(timestamps, rule):
+    """Start of the bucket each epoch-second timestamp falls into"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if rule == "week":
+        return (timestamps + EPOCH_TO_MONDAY) // WEEK_SECONDS * WEEK_SECONDS - EPOCH_TO_MONDAY
+    if rule == "month":
+        months = timestamps.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64)
+    return timestamps // rule * rule
+
+
+class HorizonRollup:
+    """Materialized OHLCV bars at one bucket size, extended in place.
+
+    The last bar stays open and is updated until a base bar from a later
+    bucket arrives. Storage grows by doubling, so appends are amortized O(1);
+    ``series`` copies only the requested tail.
+    """
+
+    def __init__(self, rule, capacity=1024):
+        self.rule = rule
+        self.size = 0
+        self.late_bars = 0
+        self._arrays = {
+            name: np.empty(capacity, dtype=np.int64 if name == 'timestamp' else np.float64)
+            for name in FIELDS
+        }
+
+    def ingest(self, timestamp, open_, high, low, close, volume):
+        """Fold time-ordered base bars into the rollup"""
+        buckets = bucket_starts(timestamp, self.rule)
+        if len(buckets) == 0:
+            return
+
+        arrays = self._arrays
+        if self.size:
+            last_bucket = arrays['timestamp'][self.size - 1]
+            late = buckets < last_bucket
+            if late.any():
+                # Bars older than the open bucket can no longer be applied
+                self.late_bars += int(late.sum())
+                keep = ~late
+                buckets, open_, high, low, close, volume = (
+                    buckets[keep], open_[keep], high[keep], low[keep], close[keep], volume[keep]
+                )
+                if len(buckets) == 0:
+                    return
+
+        # One aggregated bar per distinct bucket in the batch
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)] - 1
+        new = {
+            'timestamp': buckets[starts],
+            'open': open_[starts],
+            'high': np.maximum.reduceat(high, starts),
+            'low': np.minimum.reduceat(low, starts),
+            'close': close[ends],
+            'volume': np.add.reduceat(volume, starts)
+        }
+
+        if self.size and new['timestamp'][0] == arrays['timestamp'][self.size - 1]:
+            # Merge the first aggregate into the still-open last bar
+            i = self.size - 1
+            arrays['high'][i] = max(arrays['high'][i], new['high'][0])
+            arrays['low'][i] = min(arrays['low'][i], new['low'][0])
+            arrays['close'][i] = new['close'][0]
+            arrays['volume'][i] += new['volume'][0]
+            new = {name: values[1:] for name, values in new.items()}
+
+        count = len(new['timestamp'])
+        if count == 0:
+            return
+        self._reserve(self.size + count)
+        for name in FIELDS:
+            self._arrays[name][self.size:self.size + count] = new[name]
+        self.size += count
+
+    def series(self, count=None):
+        """Copy of the materialized bars (most recent ``count`` when given)"""
+        # Views would see the open bar change, or go stale when storage grows
+        start = 0 if count is None else max(0, self.size - count)
+        return {name: self._arrays[name][start:self.size].copy() for name in FIELDS}
+
+    def _reserve(self, needed):
+        """Grow the backing arrays to hold at least ``needed`` bars"""
+        capacity = len(self._arrays['timestamp'])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in FIELDS:
+            grown = np.empty(capacity, dtype=self._arrays[name].dtype)
+            grown[:self.size] = self._arrays[name][:self.size]
+            self._arrays[name] = grown
+
+
+class RollupEngine:
+    """Per-asset rollups at every PREDICTION_HORIZONS bucket size.
+
+    Rollups are bootstrapped from the history store on first use and then
+    kept current incrementally: new store bars and live ticks are folded in
+    as they arrive, so readers always get a precomputed series.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, store=None, horizons=PREDICTION_HORIZONS):
+        self.store = store or HistoryStore.open()
+        self.horizons = list(horizons)
+        self._rollups = {}
+        self._synced_rows = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def open(cls, store=None):
+        """Return the process-wide engine for a history store"""
+        store = store or HistoryStore.open()
+        with cls._instances_lock:
+            engine = cls._instances.get(store.directory)
+            if engine is None:
+                engine = cls(store)
+                cls._instances[store.directory] = engine
+            return engine
+
+    def series(self, asset, horizon, count=None):
+        """Precomputed OHLCV bars for an asset at a horizon, copied under the lock"""
+        with self._lock:
+            self._sync_from_store(asset)
+            return self._asset_rollups(asset)[horizon].series(count)
+
+    def ingest_bars(self, asset, bars):
+        """Fold new base bars (dict of arrays, time-ordered) into every horizon"""
+        with self._lock:
+            self._sync_from_store(asset)
+            self._fold(asset, bars)
+
+    def ingest_ticks(self, asset, timestamps, prices, volumes):
+        """Fold raw ticks in as single-price bars"""
+        prices = np.asarray(prices, dtype=np.float64)
+        self.ingest_bars(asset, {
+            'timestamp': np.asarray(timestamps).astype(np.int64),
+            'open': prices,
+            'high': prices,
+            'low': prices,
+            'close': prices,
+            'volume': np.asarray(volumes, dtype=np.float64)
+        })
+
+    def _sync_from_store(self, asset):
+        """Fold store bars appended since the last sync"""
+        rows = self.store.version(asset)
+        synced = self._synced_rows.get(asset, 0)
+        if rows > synced:
+            columns = self.store.columns(asset)
+            self._fold(asset, {name: columns[name][synced:rows] for name in FIELDS})
+            self._synced_rows[asset] = rows
+
+    def _fold(self, asset, bars):
+        """Apply base bars to every horizon rollup of an asset"""
+        rollups = self._asset_rollups(asset)
+        for rollup in rollups.values():
+            rollup.ingest(*(np.asarray(bars[name]) for name in FIELDS))
+
+    def _asset_rollups(self, asset):
+        """Rollups for an asset, created empty on first use"""
+        rollups = self._rollups.get(asset)
+        if rollups is None:
+            rollups = {horizon: HorizonRollup(HORIZON_BUCKETS[horizon]) for horizon in self.horizons}
+            self._rollups[asset] = rollups
+        return rollups
@@ -1,10 +1,9 @@
 import streamlit as st
 from datetime import datetime
-from utils.user_database import UserDatabase
 
 class SessionManager:
-    def __init__(self):
-        self.user_db = UserDatabase()
+    def __init__(self, activity_writer):
+        self.activity_writer = activity_writer
         self.initialize_session()
     
     def initialize_session(self):
@@ -25,15 +24,14 @@ class SessionManager:
         """Log user activity during session"""
         if st.session_state.get('logged_in', False):
             username = st.session_state.username
-            self.user_db.log_user_activity(username, activity_type, details)
+            # Queued; the background writer persists it in batches
+            self.activity_writer.log(username, activity_type, details)
     
-    @staticmethod
-    def logout():
+    def logout(self):
         """Logout user and clear session"""
         if st.session_state.get('logged_in', False):
             # Log logout activity
-            user_db = UserDatabase()
-            user_db.log_user_activity(st.session_state.username, "logout")
+            self.activity_writer.log(st.session_state.username, "logout")
         
         # Clear session state
         for key in list(st.session_state.keys()):
@@ -0,0 +1,260 @@
+import json
+import os
+import sqlite3
+import threading
+from config.settings import STORAGE_BACKEND, SQLITE_DATABASE_PATH
+from utils.activity_journal import ActivityJournal
+
+ACTIVITY_RETENTION = 100
+
+
+class JSONStorageBackend:
+    """Users in data/users.json, activities in the append-only journal"""
+
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.users_file = os.path.join(data_dir, "users.json")
+        self.activity_file = os.path.join(data_dir, "user_activity.json")
+        self.activity_journal_dir = os.path.join(data_dir, "activity_journal")
+        self._users_lock = threading.Lock()
+        self._write_listeners = []
+        self.ensure_data_directory()
+        self.activity_journal = ActivityJournal.open(
+            self.activity_journal_dir, retention=ACTIVITY_RETENTION
+        )
+        self.import_legacy_activities()
+
+    def ensure_data_directory(self):
+        """Create data directory if it doesn't exist"""
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # Initialize files if they don't exist
+        if not os.path.exists(self.users_file):
+            self.save_json({}, self.users_file)
+
+    def import_legacy_activities(self):
+        """Seed an empty activity journal from the old user_activity.json file"""
+        if os.path.exists(self.activity_file):
+            self.activity_journal.seed_if_empty(self.load_legacy_activities)
+
+    def load_legacy_activities(self):
+        """Flatten user_activity.json into (username, entry) pairs"""
+        activities = self.load_json(self.activity_file)
+        return [
+            (username, entry)
+            for username, entries in activities.items()
+            for entry in entries[-ACTIVITY_RETENTION:]
+        ]
+
+    def load_json(self, filepath):
+        """Load JSON data from file"""
+        try:
+            with open(filepath, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_json(self, data, filepath):
+        """Save JSON data to file"""
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def load_users(self):
+        """Load every user record"""
+        return self.load_json(self.users_file)
+
+    def version(self):
+        """Change stamp for users.json, used to invalidate cached records"""
+        try:
+            stat = os.stat(self.users_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def add_write_listener(self, callback):
+        """Call callback(username) whenever a user record is written"""
+        self._write_listeners.append(callback)
+
+    def create_user(self, user_data):
+        """Insert a user record, returning False if the username is taken"""
+        with self._users_lock:
+            users = self.load_json(self.users_file)
+
+            if user_data['username'] in users:
+                return False
+
+            users[user_data['username']] = user_data
+            self.save_json(users, self.users_file)
+
+        for callback in self._write_listeners:
+            callback(user_data['username'])
+        return True
+
+    def get_user(self, username):
+        """Fetch one user record or None"""
+        return self.load_json(self.users_file).get(username)
+
+    def append_activities(self, records):
+        """Store (username, entry) activity pairs"""
+        self.activity_journal.append_many(records)
+
+    def get_activities(self, username, limit=50):
+        """Most recent activities for a user, oldest first"""
+        return self.activity_journal.tail(username, limit)
+
+    def activity_usernames(self):
+        """Users with logged activity"""
+        return self.activity_journal.usernames()
+
+
+class SQLiteStorageBackend:
+    """SQLite store in WAL mode with one connection per thread.
+
+    WAL lets concurrent Streamlit sessions read while another session
+    writes. Users are looked up by primary key and activities through an
+    index on (username, timestamp).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS activities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        activity_type TEXT NOT NULL,
+        details TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_activities_user_time
+        ON activities (username, timestamp);
+    """
+
+    def __init__(self, db_path="data/users.db", retention=ACTIVITY_RETENTION):
+        self.db_path = db_path
+        self.retention = retention
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._write_listeners = []
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection().executescript(self.SCHEMA)
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def version(self):
+        """No file stamp; cached records are invalidated by write notifications"""
+        return None
+
+    def add_write_listener(self, callback):
+        """Call callback(username) whenever a user record is written"""
+        self._write_listeners.append(callback)
+
+    def create_user(self, user_data):
+        """Insert a user record, returning False if the username is taken"""
+        conn = self.connection()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO users (username, password, data) VALUES (?, ?, ?)",
+                (user_data['username'], user_data['password'], json.dumps(user_data))
+            )
+        if cursor.rowcount != 1:
+            return False
+
+        for callback in self._write_listeners:
+            callback(user_data['username'])
+        return True
+
+    def import_users(self, users):
+        """Bulk insert user records, skipping usernames that already exist"""
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, password, data) VALUES (?, ?, ?)",
+                [(username, record.get('password', ''), json.dumps(record))
+                 for username, record in users.items()]
+            )
+
+        for callback in self._write_listeners:
+            callback(None)
+
+    def get_user(self, username):
+        """Fetch one user record or None"""
+        row = self.connection().execute(
+            "SELECT data FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def append_activities(self, records):
+        """Store (username, entry) activity pairs and enforce retention"""
+        rows = [
+            (username, entry['timestamp'], entry['activity_type'],
+             json.dumps(entry.get('details') or {}))
+            for username, entry in records
+        ]
+        if not rows:
+            return
+
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO activities (username, timestamp, activity_type, details) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            for username in {row[0] for row in rows}:
+                conn.execute(
+                    "DELETE FROM activities WHERE username = ? AND id NOT IN ("
+                    "SELECT id FROM activities WHERE username = ? "
+                    "ORDER BY timestamp DESC, id DESC LIMIT ?)",
+                    (username, username, self.retention)
+                )
+
+    def get_activities(self, username, limit=50):
+        """Most recent activities for a user, oldest first"""
+        # SQLite treats a negative LIMIT as no limit; match the journal's empty result
+        if limit <= 0:
+            return []
+        rows = self.connection().execute(
+            "SELECT timestamp, activity_type, details FROM activities "
+            "WHERE username = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (username, limit)
+        ).fetchall()
+        return [
+            {'timestamp': timestamp, 'activity_type': activity_type,
+             'details': json.loads(details)}
+            for timestamp, activity_type, details in reversed(rows)
+        ]
+
+
+def create_storage_backend(backend_name=None):
+    """Build the storage backend selected in config.settings"""
+    backend_name = backend_name or STORAGE_BACKEND
+    if backend_name == "sqlite":
+        return SQLiteStorageBackend(SQLITE_DATABASE_PATH)
+    if backend_name == "json":
+        return JSONStorageBackend()
+    raise ValueError(f"Unknown storage backend: {backend_name}")
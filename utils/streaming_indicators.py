@@ -0,0 +1,245 @@
+"""Incremental indicators that update in O(1) per new price.
+
+Each indicator keeps only the state it needs, returns the latest value
+from ``update`` and round-trips through ``to_state``/``from_state`` as a
+small JSON-compatible dict. ``StreamingIndicators`` reproduces the
+columns of ``utils.helpers.calculate_technical_indicators`` tick by tick.
+"""
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+class RollingSMA:
+    """Simple moving average over a fixed window using a compensated running sum"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def update(self, value):
+        """Feed one value and return the updated indicator"""
+        if len(self.values) == self.window:
+            self._add(-self.values[0])
+        self.values.append(value)
+        self._add(value)
+        return self.value
+
+    @property
+    def value(self):
+        """Current value, NaN until the window is full"""
+        if len(self.values) < self.window:
+            return NAN
+        return (self.total + self.compensation) / self.window
+
+    def _add(self, value):
+        # Neumaier summation keeps the running sum from drifting over long streams
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def to_state(self):
+        """Compact JSON-compatible snapshot of the indicator state"""
+        return {'window': self.window, 'values': list(self.values),
+                'total': self.total, 'compensation': self.compensation}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an indicator from to_state() output"""
+        indicator = cls(state['window'])
+        indicator.values.extend(state['values'])
+        indicator.total = state['total']
+        indicator.compensation = state['compensation']
+        return indicator
+
+
+class EMA:
+    """Exponential moving average, equal to pandas ``ewm(span=n, adjust=False)``"""
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.value = NAN
+
+    def update(self, value):
+        """Feed one value and return the updated indicator"""
+        if math.isnan(self.value):
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1 - self.alpha) * self.value
+        return self.value
+
+    def to_state(self):
+        """Compact JSON-compatible snapshot of the indicator state"""
+        return {'span': self.span, 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an indicator from to_state() output"""
+        indicator = cls(state['span'])
+        indicator.value = state['value']
+        return indicator
+
+
+class RSI:
+    """Relative Strength Index over ``window`` price changes.
+
+    ``smoothing='simple'`` averages gains and losses over a rolling window,
+    matching ``calculate_technical_indicators``. ``smoothing='wilder'`` seeds
+    with that average and then applies Wilder's recursive smoothing.
+    """
+
+    def __init__(self, window=14, smoothing='simple'):
+        if smoothing not in ('simple', 'wilder'):
+            raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+        self.window = window
+        self.smoothing = smoothing
+        self.last_price = NAN
+        self.gains = RollingSMA(window)
+        self.losses = RollingSMA(window)
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self.value = NAN
+
+    def update(self, price):
+        """Feed one value and return the updated indicator"""
+        if math.isnan(self.last_price):
+            # The batch version treats the undefined first change as 0
+            delta = 0.0 if self.smoothing == 'simple' else NAN
+        else:
+            delta = price - self.last_price
+        self.last_price = price
+        if math.isnan(delta):
+            return self.value
+
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.smoothing == 'wilder' and not math.isnan(self.avg_gain):
+            n = self.window
+            self.avg_gain = (self.avg_gain * (n - 1) + gain) / n
+            self.avg_loss = (self.avg_loss * (n - 1) + loss) / n
+        else:
+            self.avg_gain = self.gains.update(gain)
+            self.avg_loss = self.losses.update(loss)
+
+        self.value = _rsi(self.avg_gain, self.avg_loss)
+        return self.value
+
+    def to_state(self):
+        """Compact JSON-compatible snapshot of the indicator state"""
+        state = {'window': self.window, 'smoothing': self.smoothing,
+                 'last_price': self.last_price, 'avg_gain': self.avg_gain,
+                 'avg_loss': self.avg_loss, 'value': self.value}
+        if self.smoothing == 'simple' or math.isnan(self.avg_gain):
+            state['gains'] = self.gains.to_state()
+            state['losses'] = self.losses.to_state()
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an indicator from to_state() output"""
+        indicator = cls(state['window'], state['smoothing'])
+        indicator.last_price = state['last_price']
+        indicator.avg_gain = state['avg_gain']
+        indicator.avg_loss = state['avg_loss']
+        indicator.value = state['value']
+        if 'gains' in state:
+            indicator.gains = RollingSMA.from_state(state['gains'])
+            indicator.losses = RollingSMA.from_state(state['losses'])
+        return indicator
+
+
+class MACD:
+    """MACD line, signal line and histogram from fast/slow/signal EMAs"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = {'macd': NAN, 'signal': NAN, 'histogram': NAN}
+
+    def update(self, price):
+        """Feed one value and return the updated indicator"""
+        macd = self.fast.update(price) - self.slow.update(price)
+        signal = self.signal.update(macd)
+        self.value = {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+        return self.value
+
+    def to_state(self):
+        """Compact JSON-compatible snapshot of the indicator state"""
+        return {'fast': self.fast.to_state(), 'slow': self.slow.to_state(),
+                'signal': self.signal.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an indicator from to_state() output"""
+        indicator = cls()
+        indicator.fast = EMA.from_state(state['fast'])
+        indicator.slow = EMA.from_state(state['slow'])
+        indicator.signal = EMA.from_state(state['signal'])
+        macd = indicator.fast.value - indicator.slow.value
+        signal = indicator.signal.value
+        indicator.value = {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+        return indicator
+
+
+class StreamingIndicators:
+    """Tick-by-tick equivalent of calculate_technical_indicators plus MACD"""
+
+    def __init__(self):
+        self.sma_20 = RollingSMA(20)
+        self.sma_50 = RollingSMA(50)
+        self.rsi = RSI(14)
+        self.macd = MACD()
+
+    @classmethod
+    def from_prices(cls, prices):
+        """Warm up from a price history"""
+        indicators = cls()
+        for price in prices:
+            indicators.update(float(price))
+        return indicators
+
+    def update(self, price):
+        """Feed one new price and return the latest indicator values"""
+        macd = self.macd.update(price)
+        return {
+            'price': price,
+            'sma_20': self.sma_20.update(price),
+            'sma_50': self.sma_50.update(price),
+            'rsi': self.rsi.update(price),
+            'macd': macd['macd'],
+            'macd_signal': macd['signal'],
+            'macd_histogram': macd['histogram']
+        }
+
+    def to_state(self):
+        """Compact JSON-compatible snapshot of the indicator state"""
+        return {'sma_20': self.sma_20.to_state(), 'sma_50': self.sma_50.to_state(),
+                'rsi': self.rsi.to_state(), 'macd': self.macd.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an indicator from to_state() output"""
+        indicators = cls()
+        indicators.sma_20 = RollingSMA.from_state(state['sma_20'])
+        indicators.sma_50 = RollingSMA.from_state(state['sma_50'])
+        indicators.rsi = RSI.from_state(state['rsi'])
+        indicators.macd = MACD.from_state(state['macd'])
+        return indicators
+
+
+def _rsi(avg_gain, avg_loss):
+    """RSI from average gain/loss with the batch version's 0/0 and x/0 handling"""
+    if math.isnan(avg_gain) or math.isnan(avg_loss):
+        return NAN
+    if avg_loss == 0:
+        return NAN if avg_gain == 0 else 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -0,0 +1,170 @@
+import threading
+import numpy as np
+from config.settings import MARKET_OPTIONS, TICK_BUFFER_CAPACITY, TICK_INDICATOR_WARMUP
+from utils.streaming_indicators import StreamingIndicators
+
+TICK_FIELDS = ('timestamp', 'bid', 'ask', 'volume')
+
+
+class TickRingBuffer:
+    """Fixed-size ring of the most recent ticks for one asset.
+
+    Every tick is written twice, at ``i`` and ``i + capacity``, so the last
+    ``k`` ticks always form one contiguous slice and ``last`` can return
+    zero-copy views. Memory is allocated once and never grows.
+
+    Appends are lock-free for a single writer thread: the writer claims its
+    slots, writes the data and publishes the new tick count last. ``last``
+    views can be overwritten once the writer laps them; ``snapshot`` copies
+    and retries until no claimed slot overlapped the copy.
+    """
+
+    def __init__(self, capacity=TICK_BUFFER_CAPACITY):
+        self.capacity = capacity
+        self._arrays = {name: np.zeros(2 * capacity, dtype=np.float64) for name in TICK_FIELDS}
+        self._count = 0
+        self._reserved = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def nbytes(self):
+        """Preallocated memory of the buffer"""
+        return sum(array.nbytes for array in self._arrays.values())
+
+    @property
+    def total_ticks(self):
+        """Number of ticks ever appended"""
+        return self._count
+
+    def append(self, timestamp, bid, ask, volume):
+        """Append one tick (single writer only)"""
+        count = self._count
+        self._reserved = count + 1
+        i = count % self.capacity
+        for name, value in zip(TICK_FIELDS, (timestamp, bid, ask, volume)):
+            array = self._arrays[name]
+            array[i] = value
+            array[i + self.capacity] = value
+        self._count = count + 1
+
+    def append_many(self, timestamps, bids, asks, volumes):
+        """Append a batch of ticks (single writer only)"""
+        columns = [np.asarray(values, dtype=np.float64)
+                   for values in (timestamps, bids, asks, volumes)]
+        n = len(columns[0])
+        if n == 0:
+            return
+
+        count = self._count
+        if n > self.capacity:
+            # Only the newest ``capacity`` ticks can survive anyway
+            columns = [values[-self.capacity:] for values in columns]
+            count += n - self.capacity
+            n = self.capacity
+
+        self._reserved = count + n
+        positions = (count + np.arange(n)) % self.capacity
+        for name, values in zip(TICK_FIELDS, columns):
+            array = self._arrays[name]
+            array[positions] = values
+            array[positions + self.capacity] = values
+        self._count = count + n
+
+    def last(self, k=None):
+        """Zero-copy views of the last ``k`` ticks (all retained ticks by default)"""
+        return self._views(self._count, k)
+
+    def snapshot(self, k=None):
+        """Copy of the last ``k`` ticks, retried if the writer overtook the read"""
+        return self.snapshot_since(0, k)[0]
+
+    def snapshot_since(self, count, k=None):
+        """Copy of at most the last ``k`` ticks appended after tick number ``count``, and the new count"""
+        while True:
+            start_count = self._count
+            new = start_count - count
+            copies = {name: view.copy() for name, view in
+                      self._views(start_count, new if k is None else min(k, new)).items()}
+            k_read = len(copies['timestamp'])
+            # Safe unless the writer has claimed (or is writing) one of the copied slots
+            if self._reserved - start_count <= self.capacity - k_read:
+                return copies, start_count
+
+    def _views(self, count, k):
+        """Views of the last ``k`` of the first ``count`` ticks"""
+        available = min(count, self.capacity)
+        k = available if k is None else max(0, min(k, available))
+        end = count % self.capacity + self.capacity
+        return {name: array[end - k:end] for name, array in self._arrays.items()}
+
+
+class TickStore:
+    """Ring buffers of recent ticks for every asset in MARKET_OPTIONS"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, assets=None, capacity=TICK_BUFFER_CAPACITY):
+        assets = assets or [asset for market_assets in MARKET_OPTIONS.values()
+                            for asset in market_assets]
+        self.capacity = capacity
+        self._buffers = {asset: TickRingBuffer(capacity) for asset in assets}
+        # Per asset: [StreamingIndicators, ticks fed so far, latest values]
+        self._indicators = {}
+        self._indicator_lock = threading.Lock()
+
+    @classmethod
+    def open(cls):
+        """Return the process-wide tick store"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def buffer(self, asset):
+        """Ring buffer for an asset"""
+        return self._buffers[asset]
+
+    def assets(self):
+        """Assets with a buffer"""
+        return list(self._buffers)
+
+    def append_many(self, asset, timestamps, bids, asks, volumes):
+        """Append a batch of ticks for one asset"""
+        self._buffers[asset].append_many(timestamps, bids, asks, volumes)
+
+    def last(self, asset, k=None):
+        """Zero-copy views of an asset's last ``k`` ticks"""
+        return self._buffers[asset].last(k)
+
+    def mid_prices(self, asset, k=None):
+        """Mid prices of the last ``k`` ticks, shaped for calculate_technical_indicators"""
+        ticks = self._buffers[asset].snapshot(k)
+        return {'timestamp': ticks['timestamp'], 'price': (ticks['bid'] + ticks['ask']) / 2}
+
+    def live_indicators(self, asset, warmup=TICK_INDICATOR_WARMUP):
+        """Latest tick-level indicator values (price, sma_20, sma_50, rsi, macd...), or None before any tick.
+
+        Only the ticks that arrived since the previous call are fed to the
+        asset's streaming state, so a read costs O(new ticks) and the feed's
+        writer thread never pays for it.
+        """
+        buffer = self._buffers[asset]
+        with self._indicator_lock:
+            state = self._indicators.get(asset)
+            fed = state[1] if state is not None else 0
+            ticks, count = buffer.snapshot_since(fed, warmup)
+            if state is None or count - fed > len(ticks['timestamp']):
+                # First read, or too far behind: restart from the recent ticks
+                state = self._indicators[asset] = [StreamingIndicators(), 0, None]
+            state[1] = count
+            indicators = state[0]
+            for price in ((ticks['bid'] + ticks['ask']) / 2).tolist():
+                state[2] = indicators.update(price)
+            return dict(state[2]) if state[2] is not None else None
+
+    def memory_bytes(self):
+        """Preallocated memory across all buffers"""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
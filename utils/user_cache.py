@@ -0,0 +1,101 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from config.settings import USER_CACHE_SIZE, USER_CACHE_TTL
+
+_MISSING = object()
+
+
+class UserRecordCache:
+    """LRU cache of user records in front of a storage backend.
+
+    Entries expire after ``ttl`` seconds. The whole cache is dropped when
+    the backend's version stamp changes (users.json mtime for the JSON
+    store); stores without a stamp rely on write notifications instead.
+    Missing users are cached too, so repeated failed logins stay cheap.
+
+    Loads run outside the lock; a load is only cached if no invalidation
+    for that user (or of everything) happened while it ran. Callers get
+    copies, so mutating a returned record never changes the cache.
+    """
+
+    def __init__(self, max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._version = None
+        # Bumped by invalidate(); a load that saw an older generation is stale.
+        # Per-user generations exist only while that user has loads in flight:
+        # username -> [loads in flight, generation]
+        self._generation = 0
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get_or_load(self, username, loader, version=None):
+        """Return the cached record for username, calling loader on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._stats['invalidations'] += 1
+                self._entries.clear()
+                self._version = version
+
+            entry = self._entries.get(username)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._entries.move_to_end(username)
+                self._stats['hits'] += 1
+                record = entry[0]
+                return None if record is _MISSING else copy.deepcopy(record)
+            self._stats['misses'] += 1
+            loading = self._loading.setdefault(username, [0, 0])
+            loading[0] += 1
+            generation = (self._generation, loading[1])
+
+        try:
+            record = loader(username)
+        except BaseException:
+            with self._lock:
+                self._finish_load(username, loading)
+            raise
+
+        with self._lock:
+            self._finish_load(username, loading)
+            current = (self._generation, loading[1])
+            if version == self._version and generation == current:
+                self._entries[username] = (_MISSING if record is None else record, now)
+                self._entries.move_to_end(username)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return copy.deepcopy(record)
+
+    def invalidate(self, username=None):
+        """Drop one user's entry, or everything when username is None"""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+                self._generation += 1
+            else:
+                self._entries.pop(username, None)
+                loading = self._loading.get(username)
+                if loading is not None:
+                    loading[1] += 1
+            self._stats['invalidations'] += 1
+
+    def _finish_load(self, username, loading):
+        """Count a load as done; forget the user's generation once none are in flight (lock held)"""
+        loading[0] -= 1
+        if loading[0] == 0 and self._loading.get(username) is loading:
+            del self._loading[username]
+
+    def stats(self):
+        """Hit/miss counters plus current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
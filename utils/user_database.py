@@ -1,85 +1,58 @@
-import json
-import os
 from datetime import datetime
+from utils.storage_backends import create_storage_backend
 
 class UserDatabase:
-    def __init__(self):
-        self.users_file = "data/users.json"
-        self.activity_file = "data/user_activity.json"
-        self.ensure_data_directory()
-    
-    def ensure_data_directory(self):
-        """Create data directory if it doesn't exist"""
-        os.makedirs("data", exist_ok=True)
-        
-        # Initialize files if they don't exist
-        if not os.path.exists(self.users_file):
-            self.save_json({}, self.users_file)
-        
-        if not os.path.exists(self.activity_file):
-            self.save_json({}, self.activity_file)
-    
-    def load_json(self, filepath):
-        """Load JSON data from file"""
-        try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-    
-    def save_json(self, data, filepath):
-        """Save JSON data to file"""
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+    def __init__(self, backend=None, user_cache=None):
+        self.backend = backend or create_storage_backend()
+        self.user_cache = user_cache
+        if user_cache is not None:
+            self.backend.add_write_listener(user_cache.invalidate)
     
     def create_user(self, user_data):
         """Create new user account"""
-        users = self.load_json(self.users_file)
-        
-        if user_data['username'] in users:
+        if not self.backend.create_user(user_data):
             return False  # User already exists
         
-        users[user_data['username']] = user_data
-        self.save_json(users, self.users_file)
-        
         # Log registration
         self.log_user_activity(user_data['username'], "registration")
         return True
     
     def verify_user(self, username, password_hash):
         """Verify user credentials"""
-        users = self.load_json(self.users_file)
+        user = self.get_user_record(username)
         
-        if username in users:
-            return users[username]['password'] == password_hash
+        if user is not None:
+            return user['password'] == password_hash
         return False
     
     def get_user_info(self, username):
         """Get user information"""
-        users = self.load_json(self.users_file)
-        return users.get(username, {})
-    
-    def log_user_activity(self, username, activity_type, details=None):
-        """Log user activity"""
-        activities = self.load_json(self.activity_file)
-        
-        if username not in activities:
-            activities[username] = []
-        
-        activity_entry = {
+        return self.get_user_record(username) or {}
+    
+    def get_user_record(self, username):
+        """Fetch a user record through the cache when one is configured"""
+        if self.user_cache is None:
+            return self.backend.get_user(username)
+        return self.user_cache.get_or_load(username, self.backend.get_user, self.backend.version())
+    
+    @staticmethod
+    def build_activity_entry(activity_type, details=None):
+        """Build a timestamped activity entry"""
+        return {
             'timestamp': datetime.now().isoformat(),
             'activity_type': activity_type,
             'details': details or {}
         }
-        
-        activities[username].append(activity_entry)
-        
-        # Keep only last 100 activities per user
-        activities[username] = activities[username][-100:]
-        
-        self.save_json(activities, self.activity_file)
+    
+    def log_user_activity(self, username, activity_type, details=None):
+        """Log user activity"""
+        self.log_user_activities([(username, self.build_activity_entry(activity_type, details))])
+    
+    def log_user_activities(self, records):
+        """Log a batch of (username, activity_entry) pairs in one write"""
+        # The backend keeps only the last 100 activities per user
+        self.backend.append_activities(records)
     
     def get_user_activities(self, username, limit=50):
         """Get user activity history"""
-        activities = self.load_json(self.activity_file)
-        return activities.get(username, [])[-limit:]
\ No newline at end of file
+        return self.backend.get_activities(username, limit)